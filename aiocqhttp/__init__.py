@@ -8,25 +8,27 @@ import asyncio
 import hmac
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import (Dict, Any, Optional, AnyStr, Callable, Union, Awaitable,
-                    Coroutine)
+                    Coroutine, Hashable, Iterable, List, Tuple,
+                    AsyncIterator)
 
-try:
-    import ujson as json
-except ImportError:
-    import json
-
-from quart import Quart, request, abort, jsonify, websocket, Response
+from quart import Quart, request, abort, websocket, Response
 
 from .api import AsyncApi, SyncApi
 from .api_impl import (SyncWrapperApi, HttpApi, WebSocketReverseApi,
-                       UnifiedApi, ResultStore)
+                       WebSocketForwardApi, UnifiedApi, IDEMPOTENT_ACTIONS)
 from .bus import EventBus
+from .cache import ApiCache
+from .codec import JsonCodec
+from .dispatcher import EventDispatcher, KeyedSerializer
 from .exceptions import Error, TimingError
 from .event import Event
-from .message import Message, MessageSegment
+from .message import Message, MessageSegment, FrozenMessage, MessageBuilder
+from .roster import GroupRoster
+from .throttle import ConcurrencyLimiter, SendScheduler
 from .utils import ensure_async, run_async_funcs
-from .typing import Message_T
+from .typing import Message_T, CachePolicy_T, RateLimit_T
 
 from . import exceptions
 from .exceptions import *  # noqa: F401, F403
@@ -36,11 +38,19 @@ __all__ = [
     'Event',
     'Message',
     'MessageSegment',
+    'FrozenMessage',
+    'MessageBuilder',
 ]
 __all__ += exceptions.__all__
 
 __pdoc__ = {}
 
+_BROADCAST_ID_KEYS = {
+    'group': 'group_id',
+    'discuss': 'discuss_id',
+    'private': 'user_id',
+}
+
 
 def _deco_maker(deco_method: Callable, type_: str) -> Callable:
 
@@ -99,6 +109,29 @@ class CQHttp(AsyncApi):
                  secret: Optional[AnyStr] = None,
                  message_class: Optional[type] = None,
                  api_timeout_sec: Optional[float] = None,
+                 api_pool_limits: Optional[Dict[str, Any]] = None,
+                 api_http2: bool = False,
+                 api_cache: Optional[Dict[str, CachePolicy_T]] = None,
+                 api_coalesce: Union[bool, Iterable[str]] = False,
+                 send_rate_limit: Optional[RateLimit_T] = None,
+                 group_send_rate_limit: Optional[RateLimit_T] = None,
+                 ws_forward_urls: Optional[Iterable[str]] = None,
+                 api_hedge: Union[bool, Iterable[str]] = False,
+                 api_timeouts: Optional[Dict[str, float]] = None,
+                 api_adaptive_timeout: bool = False,
+                 api_concurrency: Optional[int] = None,
+                 api_queue_size: int = 100,
+                 inline_sync_handlers: bool = False,
+                 sync_executor_workers: Optional[int] = None,
+                 event_workers: Optional[int] = None,
+                 event_queue_size: int = 1000,
+                 event_overflow: str = 'drop_oldest',
+                 event_order_key: Optional[Callable[[Event],
+                                                    Optional[Hashable]]] = None,
+                 early_quick_operation: bool = False,
+                 http_async_ack: bool = False,
+                 group_roster: bool = False,
+                 json_codec: Optional[str] = None,
                  server_app_kwargs: Optional[dict] = None,
                  **kwargs):
         """
@@ -109,7 +142,7 @@ class CQHttp(AsyncApi):
         ``secret`` 参数为 OneBot 配置中填写的对应项。
 
         ``message_class`` 参数为要用来对 `Event.message` 进行转换的消息类，可使用
-        `Message`，例如：
+        `Message`，转换在第一次访问 ``event.message`` 时进行，见 `Event.from_payload`，例如：
 
         ```py
         from aiocqhttp import CQHttp, Message
@@ -122,7 +155,84 @@ class CQHttp(AsyncApi):
             assert isinstance(event.message, Message)
         ```
 
-        ``api_timeout_sec`` 参数用于设置 OneBot API 请求的超时时间，单位是秒。
+        ``api_timeout_sec`` 参数用于设置 OneBot API 请求的超时时间，单位是秒。``api_timeouts``
+        参数用于单独设置某些 API 的超时时间，值为 API 动作名到秒数的映射，例如
+        ``{'send_msg': 10}``。``api_adaptive_timeout`` 参数控制是否根据每个 API
+        近期的延迟自动确定其超时时间（不超过 ``api_timeout_sec``），见 `api_impl.UnifiedApi`。调用
+        API 时传入 ``timeout`` 参数可为本次调用指定超时时间，例如
+        ``await bot.get_group_member_list(group_id=123, timeout=120)``。
+
+        ``api_concurrency`` 参数用于限制每个机器人账号同时进行的 API 调用数，值为上限的最大值；实际上限根据
+        OneBot 的响应延迟自动调整，OneBot 变慢时降低，恢复后逐渐升高。超出上限的调用排队等待，排队数达到
+        ``api_queue_size`` 时，新的调用立即以 `exceptions.ApiOverloaded` 失败，见
+        `throttle.ConcurrencyLimiter` 和 `CQHttp.api_concurrency_stats`。
+
+        ``api_pool_limits`` 参数用于配置 HTTP API 客户端的连接池，将以命名参数形式传给
+        `httpx.Limits`，例如 ``{'max_keepalive_connections': 20}``；``api_http2``
+        参数控制 HTTP API 是否使用 HTTP/2（需安装 ``h2``）。HTTP API 客户端在 bot
+        启动时创建、停止时关闭，期间复用连接。
+
+        ``api_cache`` 参数用于按机器人账号缓存只读 API 的调用结果，值为 API 动作名到有效期秒数（或
+        ``(有效期秒数, 容量)`` 元组）的映射，例如 ``{'get_group_member_info': 300}``，见
+        `cache.ApiCache`。收到群成员变动、好友添加等通知事件时，相关缓存会自动失效；调用 API
+        时传入 ``no_cache=True`` 可跳过缓存（该参数同时传给 OneBot）。
+
+        ``api_coalesce`` 参数用于将同时发起的、动作名和参数都相同的 API 调用合并为一次请求，值为要合并的
+        API 动作名列表，传入 `True` 表示 `api_impl.IDEMPOTENT_ACTIONS` 中的只读 API。
+
+        ``send_rate_limit`` 和 ``group_send_rate_limit`` 参数分别用于限制每个机器人账号、
+        每个群的消息发送速率，值为 ``(每秒消息数, 突发数)``，例如 ``(1, 5)``。超出速率的发送将排队等待；
+        调用发送消息的 API 时传入 ``bulk=True`` 表示批量发送，优先级低于普通发送，见
+        `throttle.SendScheduler` 和 `CQHttp.send_queue_depth`。
+
+        ``ws_forward_urls`` 参数用于在 OneBot 无法连接到 bot 时，由 bot 主动连接 OneBot
+        的正向 WebSocket 服务，值为 Universal 端点的 URL 列表，例如
+        ``['ws://127.0.0.1:6700/']``。
+        bot 启动后与每个 URL 保持一个长连接，断开后自动重连；连接上收到的事件与反向 WebSocket
+        上报的事件一样处理，API 调用在没有可用的反向 WebSocket 连接时优先使用正向连接，见
+        `api_impl.WebSocketForwardApi`。
+
+        ``api_hedge`` 参数用于降低 WebSocket 连接变慢时的 API 调用延迟，值为 API 动作名列表，传入
+        `True` 表示 `api_impl.IDEMPOTENT_ACTIONS` 中的只读 API。这些 API 的 WebSocket
+        调用若超过近期 WebSocket 调用延迟的 95 分位数仍未返回，将同时通过 HTTP 发起相同的调用，采用先返回的结果，因此需同时配置
+        ``api_root``，且只应包含可安全重复调用的 API，见 `api_impl.UnifiedApi`。
+
+        ``inline_sync_handlers`` 参数控制是否将所有同步（非 ``async``）的事件处理函数和钩子函数直接在
+        event loop 中运行，而不是放到 executor 中运行；也可以使用 `utils.loop_safe`
+        装饰器单独标记。``sync_executor_workers`` 参数用于为需要在 executor
+        中运行的同步函数创建专用的线程池，值为线程数，不传入则使用 event loop 的默认 executor。
+
+        ``event_workers`` 参数用于限制同时处理的 WebSocket 上报事件数，传入后将使用该数量的
+        worker 从长度为 ``event_queue_size`` 的队列中取出事件处理，消息事件优先于其它事件；队列已满时按
+        ``event_overflow`` 参数处理，可选 ``drop_oldest``、``drop_meta``、``block``，见
+        `dispatcher.EventDispatcher`。不传入则每个事件都立即开始处理。
+
+        ``event_order_key`` 参数用于保证同一会话中的事件按收到的顺序处理，值为从事件计算键的函数。
+        键相同的事件依次处理（包括所有 before 钩子和处理函数），键不同的事件仍并行处理，返回 `None`
+        的事件不受限制。通常传入 `dispatcher.conversation_key` 即可，例如：
+
+        ```py
+        from aiocqhttp.dispatcher import conversation_key
+
+        bot = CQHttp(event_order_key=conversation_key)
+        ```
+
+        注意，启用后若处理函数中等待同一会话的后续事件，将导致等待直至超时。
+
+        ``early_quick_operation`` 参数控制是否在第一个处理函数返回非 `None` 值时，立即将其作为快速操作
+        返回给 OneBot（HTTP 上报时作为响应，WebSocket 上报时通过
+        ``.handle_quick_operation_async`` 调用），其余处理函数在后台继续运行。注意，不同层级的处理函数仍按
+        `CQHttp.on` 中所述的顺序依次运行。不启用时，需等待所有处理函数运行完成，再返回第一个非 `None` 值。
+        启用 ``event_workers`` 时，worker 在快速操作完成后继续等待后台的处理函数运行完成，因此并发限制仍然有效。
+
+        ``http_async_ack`` 参数控制是否在收到 HTTP 上报的事件并校验通过后，立即以 204
+        响应 OneBot，再按 WebSocket 上报事件的方式处理（包括 ``event_workers`` 等限制），快速操作通过
+        ``.handle_quick_operation_async`` API 执行，因此需同时配置 ``api_root``。
+
+        ``group_roster`` 参数控制是否在本地维护群列表和群成员列表的索引，见 `CQHttp.roster`。
+
+        ``json_codec`` 参数用于选择解析上报事件、收发 API 请求所用的 JSON 库，可选 ``orjson``、
+        ``ujson``、``json``，不传入则按此顺序选择第一个已安装的库，见 `codec.JsonCodec`。
 
         ``server_app_kwargs`` 参数用于配置 `Quart` 对象，将以命名参数形式传给入其初始化函数。
         """
@@ -131,9 +241,29 @@ class CQHttp(AsyncApi):
         self._bus = EventBus()
         self._before_sending_funcs = set()
         self._loop = None
+        self._event_order_key = event_order_key
+        self._serializer = KeyedSerializer()
+        self._early_quick_operation = early_quick_operation
+        self._http_async_ack = http_async_ack
+        self._codec = JsonCodec(json_codec)
+        self._emit_tasks = set()
+        self._inline_sync_handlers = inline_sync_handlers
+        self._sync_executor = ThreadPoolExecutor(
+            max_workers=sync_executor_workers,
+            thread_name_prefix='aiocqhttp-sync',
+        ) if sync_executor_workers else None
 
         self._server_app = Quart(import_name, **(server_app_kwargs or {}))
+        # after the app is created, so that self.logger is its logger
+        self._roster = GroupRoster(self._api, logger=self.logger) \
+            if group_roster else None
+        self._dispatcher = EventDispatcher(self._handle_event_with_response,
+                                           workers=event_workers,
+                                           queue_size=event_queue_size,
+                                           overflow=event_overflow,
+                                           logger=self.logger)
         self._server_app.before_serving(self._before_serving)
+        self._server_app.after_serving(self._after_serving)
         self._server_app.add_url_rule('/',
                                       methods=['POST'],
                                       view_func=self._handle_http_event)
@@ -143,27 +273,98 @@ class CQHttp(AsyncApi):
                                            view_func=self._handle_wsr)
 
         self._configure(api_root, access_token, secret, message_class,
-                        api_timeout_sec)
+                        api_timeout_sec, api_pool_limits, api_http2,
+                        api_cache, api_coalesce, send_rate_limit,
+                        group_send_rate_limit, ws_forward_urls, api_hedge,
+                        api_timeouts, api_adaptive_timeout, api_concurrency,
+                        api_queue_size)
 
     def _configure(self,
                    api_root: Optional[str] = None,
                    access_token: Optional[str] = None,
                    secret: Optional[AnyStr] = None,
                    message_class: Optional[type] = None,
-                   api_timeout_sec: Optional[float] = None):
+                   api_timeout_sec: Optional[float] = None,
+                   api_pool_limits: Optional[Dict[str, Any]] = None,
+                   api_http2: bool = False,
+                   api_cache: Optional[Dict[str, CachePolicy_T]] = None,
+                   api_coalesce: Union[bool, Iterable[str]] = False,
+                   send_rate_limit: Optional[RateLimit_T] = None,
+                   group_send_rate_limit: Optional[RateLimit_T] = None,
+                   ws_forward_urls: Optional[Iterable[str]] = None,
+                   api_hedge: Union[bool, Iterable[str]] = False,
+                   api_timeouts: Optional[Dict[str, float]] = None,
+                   api_adaptive_timeout: bool = False,
+                   api_concurrency: Optional[int] = None,
+                   api_queue_size: int = 100):
         self._message_class = message_class
         api_timeout_sec = api_timeout_sec or 60  # wait for 60 secs by default
         self._access_token = access_token
         self._secret = secret
-        self._api._http_api = HttpApi(api_root, access_token, api_timeout_sec)
-        self._wsr_api_clients = {}  # connected wsr api clients
+        running = self._loop is not None and self._loop.is_running()
+        old_http_api = self._api._http_api
+        if old_http_api and running:
+            # release the connection pool of the replaced client
+            self._loop.call_soon_threadsafe(self._loop.create_task,
+                                            old_http_api.close())
+        old_wsf_api = self._api._wsf_api
+        if old_wsf_api and running:
+            self._loop.call_soon_threadsafe(self._loop.create_task,
+                                            old_wsf_api.close())
+        self._api._http_api = HttpApi(api_root,
+                                      access_token,
+                                      api_timeout_sec,
+                                      pool_limits=api_pool_limits,
+                                      http2=api_http2,
+                                      codec=self._codec)
+        self._wsr_api_clients = {}  # self_id -> connected wsr api clients
         self._wsr_event_clients = set()
-        self._api._wsr_api = WebSocketReverseApi(self._wsr_api_clients,
-                                                 self._wsr_event_clients,
-                                                 api_timeout_sec)
+        self._wsr_api = WebSocketReverseApi(self._wsr_api_clients,
+                                            self._wsr_event_clients,
+                                            api_timeout_sec,
+                                            codec=self._codec)
+        self._api._wsr_api = self._wsr_api
+        self._api._wsf_api = WebSocketForwardApi(
+            ws_forward_urls,
+            access_token,
+            api_timeout_sec,
+            on_event=self._dispatcher.submit,
+            codec=self._codec,
+            logger=self.logger) if ws_forward_urls else None
+        if self._api._wsf_api and running:
+            self._loop.call_soon_threadsafe(self._api._wsf_api.open)
+        self._api_cache = ApiCache(api_cache) if api_cache else None
+        self._api._cache = self._api_cache
+        if api_coalesce is True:
+            api_coalesce = IDEMPOTENT_ACTIONS
+        self._api._coalesce_actions = frozenset(api_coalesce or ())
+        if api_hedge is True:
+            api_hedge = IDEMPOTENT_ACTIONS
+        self._api._hedge_actions = frozenset(api_hedge or ())
+        self._api._timeouts = dict(api_timeouts or {})
+        self._api._adaptive_timeout_sec = api_timeout_sec \
+            if api_adaptive_timeout else None
+        self._api._limiter = ConcurrencyLimiter(
+            api_concurrency, max_queue=api_queue_size
+        ) if api_concurrency else None
+        self._api._scheduler = SendScheduler(
+            send_rate_limit, group_send_rate_limit
+        ) if send_rate_limit or group_send_rate_limit else None
 
     async def _before_serving(self):
         self._loop = asyncio.get_running_loop()
+        self._api._http_api.open()
+        if self._api._wsf_api:
+            self._api._wsf_api.open()
+
+    async def _after_serving(self):
+        if self._api._wsf_api:
+            await self._api._wsf_api.close()
+        await self._dispatcher.close()
+        await self._api._http_api.close()
+        if self._sync_executor is not None:
+            # handlers have finished with the dispatcher closed
+            self._sync_executor.shutdown(wait=False)
 
     @property
     def asgi(self) -> Callable[[dict, Callable, Callable], Awaitable]:
@@ -190,6 +391,44 @@ class CQHttp(AsyncApi):
         """`api.AsyncApi` 对象，用于异步地调用 OneBot API。"""
         return self._api
 
+    @property
+    def send_queue_depth(self) -> Dict[str, int]:
+        """
+        因发送限速而正在等待的交互式和批量发送数，形如 ``{'interactive': 1, 'bulk': 100}``，
+        未启用限速时均为 0。
+        """
+        scheduler = self._api._scheduler
+        if scheduler is None:
+            return {'interactive': 0, 'bulk': 0}
+        return scheduler.queue_depth
+
+    def api_concurrency_stats(
+            self, self_id: Optional[Any] = None) -> Optional[Dict[str, float]]:
+        """
+        机器人账号 ``self_id`` 当前的 API 并发上限、进行中和排队中的调用数，形如
+        ``{'limit': 8.5, 'inflight': 8, 'queued': 3}``，未启用并发限制时返回 `None`。
+        """
+        limiter = self._api._limiter
+        if limiter is None:
+            return None
+        return limiter.stats(self_id)
+
+    @property
+    def roster(self) -> Optional[GroupRoster]:
+        """
+        `roster.GroupRoster` 对象，即群列表和群成员列表的本地索引，未启用 ``group_roster``
+        时为 `None`。每个机器人账号连接时自动加载其数据，之后根据通知事件增量更新，例如：
+
+        ```py
+        @bot.on_message('group')
+        async def handler(event):
+            roster = bot.roster
+            if roster.is_admin(event.self_id, event.group_id, event.user_id):
+                ...
+        ```
+        """
+        return self._roster
+
     @property
     def sync(self) -> SyncApi:
         """
@@ -243,9 +482,17 @@ class CQHttp(AsyncApi):
         ``event`` 参数为事件对象，``message`` 参数为要发送的消息。可额外传入 ``at_sender``
         命名参数用于控制是否 at 事件的触发者，默认为 `False`。其它命名参数作为
         OneBot API ``send_msg`` 的参数直接传递。
+
+        ``message`` 为 `message.FrozenMessage` 时，若没有注册 `before_sending`
+        钩子函数，将直接使用其缓存的 JSON 形式发送。
         """
-        msg = message if isinstance(message, Message) else Message(message)
-        await run_async_funcs(self._before_sending_funcs, event, msg, kwargs)
+        if isinstance(message, FrozenMessage) and \
+                not self._before_sending_funcs:
+            msg = message
+        else:
+            msg = message if isinstance(message, Message) else Message(message)
+            await run_async_funcs(self._before_sending_funcs, event, msg,
+                                  kwargs)
 
         at_sender = kwargs.pop('at_sender', False) and ('user_id' in event)
 
@@ -268,6 +515,70 @@ class CQHttp(AsyncApi):
 
         return await self.send_msg(**params)
 
+    async def broadcast(
+        self,
+        targets: Iterable[Tuple[str, Any]],
+        message: Message_T,
+        *,
+        concurrency: int = 8,
+        **kwargs,
+    ) -> AsyncIterator[Tuple[Tuple[str, Any], Union[Any, Exception]]]:
+        """
+        向多个目标发送同一条消息，以异步迭代器的形式按完成顺序返回每个目标的结果。
+
+        ``targets`` 参数为 ``(消息类型, 目标 ID)`` 的可迭代对象，消息类型为 ``group``、``discuss``
+        或 ``private``；``message`` 参数为要发送的消息，只序列化一次（为 `message.FrozenMessage`
+        时直接使用其缓存的 JSON 形式），之后每次发送直接复用编码结果；
+        ``concurrency`` 参数为同时进行的发送数。其它命名参数（如 ``self_id``）作为 OneBot API
+        ``send_msg`` 的参数直接传递。
+
+        每次发送都以批量优先级（见 ``send_rate_limit`` 参数）进行，不调用 `before_sending`
+        注册的钩子函数。迭代得到 ``(目标, 结果)``，发送失败时结果为所抛出的异常，例如：
+
+        ```py
+        targets = [('group', group_id) for group_id in group_ids]
+        async for target, result in bot.broadcast(targets, '公告内容'):
+            if isinstance(result, Exception):
+                ...
+        ```
+        """
+        payload = self._codec.raw(message)
+        targets = iter(targets)
+        results = asyncio.Queue()
+
+        async def work():
+            # workers share the iterator, so targets are consumed lazily
+            for target in targets:
+                try:
+                    message_type, target_id = target
+                    id_key = _BROADCAST_ID_KEYS.get(message_type)
+                    if id_key is None:
+                        raise ValueError(
+                            f'unknown message type "{message_type}"')
+                    result = await self.send_msg(message_type=message_type,
+                                                 message=payload,
+                                                 bulk=True,
+                                                 **{id_key: target_id},
+                                                 **kwargs)
+                except Exception as e:
+                    result = e
+                results.put_nowait((target, result))
+            results.put_nowait(None)
+
+        workers = [asyncio.ensure_future(work()) for _ in range(concurrency)]
+        try:
+            running = len(workers)
+            while running:
+                item = await results.get()
+                if item is None:
+                    running -= 1
+                else:
+                    yield item
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
     def before_sending(self, func: Callable) -> Callable:
         """
         注册发送消息前的钩子函数，用作装饰器，例如：
@@ -282,12 +593,17 @@ class CQHttp(AsyncApi):
         该钩子函数在刚进入 `CQHttp.send` 函数时运行，用户可在钩子函数中修改要发送的
         ``message`` 和发送参数 ``kwargs``。
         """
-        self._before_sending_funcs.add(ensure_async(func))
+        self._before_sending_funcs.add(self._ensure_async(func))
         return func
 
+    def _ensure_async(self, func: Callable) -> Callable:
+        return ensure_async(func,
+                            inline=self._inline_sync_handlers,
+                            executor=self._sync_executor)
+
     def subscribe(self, event_name: str, func: Callable) -> None:
         """注册事件处理函数。"""
-        self._bus.subscribe(event_name, ensure_async(func))
+        self._bus.subscribe(event_name, self._ensure_async(func))
 
     def unsubscribe(self, event_name: str, func: Callable) -> None:
         """取消注册事件处理函数。"""
@@ -372,7 +688,7 @@ class CQHttp(AsyncApi):
 
     def hook_before(self, event_name: str, func: Callable) -> None:
         """注册事件处理前的钩子函数。"""
-        self._bus.hook_before(event_name, ensure_async(func))
+        self._bus.hook_before(event_name, self._ensure_async(func))
 
     def unhook_before(self, event_name: str, func: Callable) -> None:
         """取消注册事件处理前的钩子函数。"""
@@ -464,6 +780,7 @@ class CQHttp(AsyncApi):
         return self.on_meta_event('lifecycle.connect')(func)
 
     async def _handle_http_event(self) -> Response:
+        data = await request.get_data()
         if self._secret:
             if 'X-Signature' not in request.headers:
                 self.logger.warning('signature header is missed')
@@ -471,12 +788,15 @@ class CQHttp(AsyncApi):
 
             sec = self._secret
             sec = sec.encode('utf-8') if isinstance(sec, str) else sec
-            sig = hmac.new(sec, await request.get_data(), 'sha1').hexdigest()
+            sig = hmac.new(sec, data, 'sha1').hexdigest()
             if request.headers['X-Signature'] != 'sha1=' + sig:
                 self.logger.warning('signature header is invalid')
                 abort(403)
 
-        payload = await request.json
+        try:
+            payload = self._codec.loads(data)
+        except ValueError:
+            payload = None
         if not isinstance(payload, dict):
             abort(400)
 
@@ -485,9 +805,15 @@ class CQHttp(AsyncApi):
                 'there is already a reverse websocket api connection, '
                 'so the event may be handled twice.')
 
+        if self._http_async_ack:
+            # quick operation, if any, will be done via API
+            await self._dispatcher.submit(payload)
+            return Response('', 204)
+
         response = await self._handle_event(payload)
         if isinstance(response, dict):
-            return jsonify(response)
+            return Response(self._codec.dumps(response),
+                            content_type='application/json')
         return Response('', 204)
 
     async def _handle_wsr(self) -> None:
@@ -516,7 +842,7 @@ class CQHttp(AsyncApi):
         try:
             while True:
                 try:
-                    payload = json.loads(await websocket.receive())
+                    payload = self._codec.loads(await websocket.receive())
                 except ValueError:
                     payload = None
 
@@ -524,7 +850,7 @@ class CQHttp(AsyncApi):
                     # ignore invalid payload
                     continue
 
-                asyncio.create_task(self._handle_event_with_response(payload))
+                await self._dispatcher.submit(payload)
         finally:
             self._remove_wsr_event_client()
 
@@ -533,9 +859,12 @@ class CQHttp(AsyncApi):
         try:
             while True:
                 try:
-                    ResultStore.add(json.loads(await websocket.receive()))
+                    result = self._codec.loads(await websocket.receive())
                 except ValueError:
-                    pass
+                    continue
+
+                if isinstance(result, dict):
+                    self._wsr_api.add_result(result)
         finally:
             self._remove_wsr_api_client()
 
@@ -545,7 +874,7 @@ class CQHttp(AsyncApi):
         try:
             while True:
                 try:
-                    payload = json.loads(await websocket.receive())
+                    payload = self._codec.loads(await websocket.receive())
                 except ValueError:
                     payload = None
 
@@ -555,11 +884,10 @@ class CQHttp(AsyncApi):
 
                 if 'post_type' in payload:
                     # is a event
-                    asyncio.create_task(
-                        self._handle_event_with_response(payload))
+                    await self._dispatcher.submit(payload)
                 elif payload:
                     # is a api result
-                    ResultStore.add(payload)
+                    self._wsr_api.add_result(payload)
         finally:
             self._remove_wsr_event_client()
             self._remove_wsr_api_client()
@@ -567,15 +895,20 @@ class CQHttp(AsyncApi):
     def _add_wsr_api_client(self) -> None:
         ws = websocket._get_current_object()
         self_id = websocket.headers['X-Self-ID']
-        self._wsr_api_clients[self_id] = ws
+        self._wsr_api_clients.setdefault(self_id, []).append(ws)
 
     def _remove_wsr_api_client(self) -> None:
+        ws = websocket._get_current_object()
+        self._wsr_api.connection_closed(ws)
         self_id = websocket.headers['X-Self-ID']
-        if self_id in self._wsr_api_clients:
+        clients = self._wsr_api_clients.get(self_id)
+        if clients and ws in clients:
             # we must check the existence here,
             # because we allow wildcard ws connections,
             # that is, the self_id may be '*'
-            del self._wsr_api_clients[self_id]
+            clients.remove(ws)
+            if not clients:
+                del self._wsr_api_clients[self_id]
 
     def _add_wsr_event_client(self) -> None:
         ws = websocket._get_current_object()
@@ -585,25 +918,67 @@ class CQHttp(AsyncApi):
         ws = websocket._get_current_object()
         self._wsr_event_clients.discard(ws)
 
-    async def _handle_event(self, payload: Dict[str, Any]) -> Any:
-        ev = Event.from_payload(payload)
+    async def _handle_event(
+            self,
+            payload: Dict[str, Any],
+            background: Optional[List[asyncio.Task]] = None) -> Any:
+        ev = Event.from_payload(payload, self._message_class)
         if not ev:
             return
 
         event_name = ev.name
         self.logger.info(f'received event: {event_name}')
 
-        if self._message_class and 'message' in ev:
-            ev['message'] = self._message_class(ev['message'])
-        results = list(
-            filter(lambda r: r is not None, await
-                   self._bus.emit(event_name, ev)))
-        # return the first non-none result
-        return results[0] if results else None
+        if self._api_cache:
+            self._api_cache.invalidate_by_event(ev)
+        if self._roster:
+            self._roster.handle_event(ev)
+
+        if not self._early_quick_operation:
+            results = await self._emit_event(ev)
+            results = [r for r in results if r is not None]
+            # return the first non-none result
+            return results[0] if results else None
+
+        first_result = asyncio.get_running_loop().create_future()
+
+        def on_result(result: Any) -> None:
+            if result is not None and not first_result.done():
+                first_result.set_result(result)
+
+        def on_done(task: asyncio.Task) -> None:
+            self._emit_tasks.discard(task)
+            exc = None if task.cancelled() else task.exception()
+            if not first_result.done():
+                if exc is not None:
+                    first_result.set_exception(exc)
+                else:
+                    first_result.set_result(None)
+            elif exc is not None:
+                self.logger.error('failed to handle event', exc_info=exc)
+
+        # the remaining handlers keep running after the first result
+        task = asyncio.ensure_future(self._emit_event(ev, on_result))
+        self._emit_tasks.add(task)
+        task.add_done_callback(on_done)
+        if background is not None:
+            background.append(task)
+        return await first_result
+
+    async def _emit_event(
+            self,
+            ev: Event,
+            callback: Optional[Callable[[Any], None]] = None) -> List[Any]:
+        key = self._event_order_key(ev) if self._event_order_key else None
+        if key is None:
+            return await self._bus.emit_each(ev.name, callback, ev)
+        return await self._serializer.run(
+            key, lambda: self._bus.emit_each(ev.name, callback, ev))
 
     async def _handle_event_with_response(self, payload: Dict[str,
                                                               Any]) -> None:
-        response = await self._handle_event(payload)
+        background = []
+        response = await self._handle_event(payload, background)
         if isinstance(response, dict):
             payload.pop('message', None)  # avoid wasting bandwidth
             payload.pop('raw_message', None)
@@ -617,3 +992,7 @@ class CQHttp(AsyncApi):
                     operation=response)
             except Error:
                 pass
+        if background:
+            # hold the dispatcher worker until the remaining handlers finish,
+            # so that event_workers still bounds them
+            await asyncio.wait(background)
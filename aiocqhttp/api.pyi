@@ -166,6 +166,8 @@ class Api:
             message: Message_T,
             auto_escape: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
+            bulk: bool = False,
     ) -> Union[Awaitable[_send_private_msg_ret], _send_private_msg_ret]:
         """
         发送私聊消息。
@@ -175,6 +177,8 @@ class Api:
             message: 要发送的内容
             auto_escape: 消息内容是否作为纯文本发送（即不解析 CQ 码），只在 `message` 字段是字符串时有效
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
+            bulk: 是否为批量发送，启用发送限速时优先级低于普通发送
         """
 
     def send_group_msg(
@@ -183,6 +187,8 @@ class Api:
             message: Message_T,
             auto_escape: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
+            bulk: bool = False,
     ) -> Union[Awaitable[_send_group_msg_ret], _send_group_msg_ret]:
         """
         发送群消息。
@@ -192,6 +198,8 @@ class Api:
             message: 要发送的内容
             auto_escape: 消息内容是否作为纯文本发送（即不解析 CQ 码），只在 `message` 字段是字符串时有效
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
+            bulk: 是否为批量发送，启用发送限速时优先级低于普通发送
         """
 
     def send_msg(
@@ -202,6 +210,8 @@ class Api:
             message: Message_T,
             auto_escape: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
+            bulk: bool = False,
     ) -> Union[Awaitable[_send_msg_ret], _send_msg_ret]:
         """
         发送消息。
@@ -213,12 +223,15 @@ class Api:
             message: 要发送的内容
             auto_escape: 消息内容是否作为纯文本发送（即不解析 CQ 码），只在 `message` 字段是字符串时有效
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
+            bulk: 是否为批量发送，启用发送限速时优先级低于普通发送
         """
 
     def delete_msg(
             self, *,
             message_id: int,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         撤回消息。
@@ -226,12 +239,14 @@ class Api:
         Args:
             message_id: 消息 ID
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_msg(
             self, *,
             message_id: int,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_get_msg_ret], _get_msg_ret]:
         """
         获取消息。
@@ -239,12 +254,14 @@ class Api:
         Args:
             message_id: 消息 ID
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_forward_msg(
             self, *,
             id: str,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_get_forward_msg_ret], _get_forward_msg_ret]:
         """
         获取合并转发消息。
@@ -252,6 +269,7 @@ class Api:
         Args:
             id: 合并转发 ID
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def send_like(
@@ -259,6 +277,7 @@ class Api:
             user_id: int,
             times: int = 1,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         发送好友赞。
@@ -267,6 +286,7 @@ class Api:
             user_id: 对方 QQ 号
             times: 赞的次数，每个好友每天最多 10 次
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def set_group_kick(
@@ -275,6 +295,7 @@ class Api:
             user_id: int,
             reject_add_request: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         群组踢人。
@@ -284,6 +305,7 @@ class Api:
             user_id: 要踢的 QQ 号
             reject_add_request: 拒绝此人的加群请求
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def set_group_ban(
@@ -292,6 +314,7 @@ class Api:
             user_id: int,
             duration: int = 30 * 60,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         群组单人禁言。
@@ -301,6 +324,7 @@ class Api:
             user_id: 要禁言的 QQ 号
             duration: 禁言时长，单位秒，0 表示取消禁言
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def set_group_anonymous_ban(
@@ -310,6 +334,7 @@ class Api:
             anonymous_flag: Optional[str] = None,
             duration: int = 30 * 60,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         群组匿名用户禁言。
@@ -320,6 +345,7 @@ class Api:
             anonymous_flag: 可选，要禁言的匿名用户的 flag（需从群消息上报的数据中获得）
             duration: 禁言时长，单位秒，无法取消匿名用户禁言
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def set_group_whole_ban(
@@ -327,6 +353,7 @@ class Api:
             group_id: int,
             enable: bool = True,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         群组全员禁言。
@@ -335,6 +362,7 @@ class Api:
             group_id: 群号
             enable: 是否禁言
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def set_group_admin(
@@ -343,6 +371,7 @@ class Api:
             user_id: int,
             enable: bool = True,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         群组设置管理员。
@@ -352,6 +381,7 @@ class Api:
             user_id: 要设置管理员的 QQ 号
             enable: True 为设置，False 为取消
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def set_group_anonymous(
@@ -359,6 +389,7 @@ class Api:
             group_id: int,
             enable: bool = True,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         群组匿名。
@@ -367,6 +398,7 @@ class Api:
             group_id: 群号
             enable: 是否允许匿名聊天
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def set_group_card(
@@ -375,6 +407,7 @@ class Api:
             user_id: int,
             card: str = '',
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         设置群名片（群备注）。
@@ -384,6 +417,7 @@ class Api:
             user_id: 要设置的 QQ 号
             card: 群名片内容，不填或空字符串表示删除群名片
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def set_group_name(
@@ -391,6 +425,7 @@ class Api:
             group_id: int,
             group_name: str,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         设置群名。
@@ -399,6 +434,7 @@ class Api:
             group_id: 群号
             group_name: 新群名
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def set_group_leave(
@@ -406,6 +442,7 @@ class Api:
             group_id: int,
             is_dismiss: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         退出群组。
@@ -414,6 +451,7 @@ class Api:
             group_id: 群号
             is_dismiss: 是否解散，如果登录号是群主，则仅在此项为 True 时能够解散
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def set_group_special_title(
@@ -423,6 +461,7 @@ class Api:
             special_title: str = '',
             duration: int = -1,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         设置群组专属头衔。
@@ -433,6 +472,7 @@ class Api:
             special_title: 专属头衔，不填或空字符串表示删除专属头衔
             duration: 专属头衔有效期，单位秒，-1 表示永久，不过此项似乎没有效果，可能是只有某些特殊的时间长度有效，有待测试
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def set_friend_add_request(
@@ -441,6 +481,7 @@ class Api:
             approve: bool = True,
             remark: str = '',
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         处理加好友请求。
@@ -450,6 +491,7 @@ class Api:
             approve: 是否同意请求
             remark: 添加后的好友备注（仅在同意时有效）
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def set_group_add_request(
@@ -459,6 +501,7 @@ class Api:
             approve: bool = True,
             reason: str = '',
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         处理加群请求／邀请。
@@ -469,17 +512,20 @@ class Api:
             approve: 是否同意请求／邀请
             reason: 拒绝理由（仅在拒绝时有效）
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_login_info(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_get_login_info_ret], _get_login_info_ret]:
         """
         获取登录号信息。
 
         Args:
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_stranger_info(
@@ -487,6 +533,7 @@ class Api:
             user_id: int,
             no_cache: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_get_stranger_info_ret], _get_stranger_info_ret]:
         """
         获取陌生人信息。
@@ -495,17 +542,20 @@ class Api:
             user_id: QQ 号
             no_cache: 是否不使用缓存（使用缓存可能更新不及时，但响应更快）
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_friend_list(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[List[_get_friend_list_ret]], List[_get_friend_list_ret]]:
         """
         获取好友列表。
 
         Args:
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_group_info(
@@ -513,6 +563,7 @@ class Api:
             group_id: int,
             no_cache: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_get_group_info_ret], _get_group_info_ret]:
         """
         获取群信息。
@@ -521,17 +572,20 @@ class Api:
             group_id: 群号
             no_cache: 是否不使用缓存（使用缓存可能更新不及时，但响应更快）
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_group_list(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[List[_get_group_list_ret]], List[_get_group_list_ret]]:
         """
         获取群列表。
 
         Args:
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_group_member_info(
@@ -540,6 +594,7 @@ class Api:
             user_id: int,
             no_cache: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_get_group_member_info_ret], _get_group_member_info_ret]:
         """
         获取群成员信息。
@@ -549,12 +604,14 @@ class Api:
             user_id: QQ 号
             no_cache: 是否不使用缓存（使用缓存可能更新不及时，但响应更快）
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_group_member_list(
             self, *,
             group_id: int,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[List[_get_group_member_list_ret]], List[_get_group_member_list_ret]]:
         """
         获取群成员列表。
@@ -562,6 +619,7 @@ class Api:
         Args:
             group_id: 群号
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_group_honor_info(
@@ -569,6 +627,7 @@ class Api:
             group_id: int,
             type: str,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_get_group_honor_info_ret], _get_group_honor_info_ret]:
         """
         获取群荣誉信息。
@@ -577,12 +636,14 @@ class Api:
             group_id: 群号
             type: 要获取的群荣誉类型，可传入 `talkative` `performer` `legend` `strong_newbie` `emotion` 以分别获取单个类型的群荣誉数据，或传入 `all` 获取所有数据
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_cookies(
             self, *,
             domain: str = '',
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_get_cookies_ret], _get_cookies_ret]:
         """
         获取 Cookies。
@@ -590,23 +651,27 @@ class Api:
         Args:
             domain: 需要获取 cookies 的域名
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_csrf_token(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_get_csrf_token_ret], _get_csrf_token_ret]:
         """
         获取 CSRF Token。
 
         Args:
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_credentials(
             self, *,
             domain: str = '',
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_get_credentials_ret], _get_credentials_ret]:
         """
         获取 QQ 相关接口凭证。
@@ -614,6 +679,7 @@ class Api:
         Args:
             domain: 需要获取 cookies 的域名
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_record(
@@ -621,6 +687,7 @@ class Api:
             file: str,
             out_format: str,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_get_record_ret], _get_record_ret]:
         """
         获取语音。
@@ -629,12 +696,14 @@ class Api:
             file: 收到的语音文件名（消息段的 `file` 参数），如 `0B38145AA44505000B38145AA4450500.silk`
             out_format: 要转换到的格式，目前支持 `mp3`、`amr`、`wma`、`m4a`、`spx`、`ogg`、`wav`、`flac`
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_image(
             self, *,
             file: str,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_get_image_ret], _get_image_ret]:
         """
         获取图片。
@@ -642,56 +711,66 @@ class Api:
         Args:
             file: 收到的图片文件名（消息段的 `file` 参数），如 `6B4DE3DFD1BD271E3297859D41C530F5.jpg`
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def can_send_image(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_can_send_image_ret], _can_send_image_ret]:
         """
         检查是否可以发送图片。
 
         Args:
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def can_send_record(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_can_send_record_ret], _can_send_record_ret]:
         """
         检查是否可以发送语音。
 
         Args:
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_status(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_get_status_ret], _get_status_ret]:
         """
         获取运行状态。
 
         Args:
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def get_version_info(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[_get_version_info_ret], _get_version_info_ret]:
         """
         获取版本信息。
 
         Args:
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def set_restart(
             self, *,
             delay: int = 0,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         重启 OneBot 实现。
@@ -699,17 +778,20 @@ class Api:
         Args:
             delay: 要延迟的毫秒数，如果默认情况下无法重启，可以尝试设置延迟为 2000 左右
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
     def clean_cache(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> Union[Awaitable[None], None]:
         """
         清理缓存。
 
         Args:
             self_id: 机器人 QQ 号
+            timeout: 本次调用的超时时间（秒），不传入则使用默认的超时时间
         """
 
 
@@ -727,6 +809,8 @@ class AsyncApi(Api):
             message: Message_T,
             auto_escape: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
+            bulk: bool = False,
     ) -> _send_private_msg_ret: ...
 
     async def send_group_msg(
@@ -735,6 +819,8 @@ class AsyncApi(Api):
             message: Message_T,
             auto_escape: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
+            bulk: bool = False,
     ) -> _send_group_msg_ret: ...
 
     async def send_msg(
@@ -745,24 +831,29 @@ class AsyncApi(Api):
             message: Message_T,
             auto_escape: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
+            bulk: bool = False,
     ) -> _send_msg_ret: ...
 
     async def delete_msg(
             self, *,
             message_id: int,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     async def get_msg(
             self, *,
             message_id: int,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_msg_ret: ...
 
     async def get_forward_msg(
             self, *,
             id: str,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_forward_msg_ret: ...
 
     async def send_like(
@@ -770,6 +861,7 @@ class AsyncApi(Api):
             user_id: int,
             times: int = 1,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     async def set_group_kick(
@@ -778,6 +870,7 @@ class AsyncApi(Api):
             user_id: int,
             reject_add_request: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     async def set_group_ban(
@@ -786,6 +879,7 @@ class AsyncApi(Api):
             user_id: int,
             duration: int = 30 * 60,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     async def set_group_anonymous_ban(
@@ -795,6 +889,7 @@ class AsyncApi(Api):
             anonymous_flag: Optional[str] = None,
             duration: int = 30 * 60,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     async def set_group_whole_ban(
@@ -802,6 +897,7 @@ class AsyncApi(Api):
             group_id: int,
             enable: bool = True,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     async def set_group_admin(
@@ -810,6 +906,7 @@ class AsyncApi(Api):
             user_id: int,
             enable: bool = True,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     async def set_group_anonymous(
@@ -817,6 +914,7 @@ class AsyncApi(Api):
             group_id: int,
             enable: bool = True,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     async def set_group_card(
@@ -825,6 +923,7 @@ class AsyncApi(Api):
             user_id: int,
             card: str = '',
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     async def set_group_name(
@@ -832,6 +931,7 @@ class AsyncApi(Api):
             group_id: int,
             group_name: str,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     async def set_group_leave(
@@ -839,6 +939,7 @@ class AsyncApi(Api):
             group_id: int,
             is_dismiss: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     async def set_group_special_title(
@@ -848,6 +949,7 @@ class AsyncApi(Api):
             special_title: str = '',
             duration: int = -1,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     async def set_friend_add_request(
@@ -856,6 +958,7 @@ class AsyncApi(Api):
             approve: bool = True,
             remark: str = '',
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     async def set_group_add_request(
@@ -865,11 +968,13 @@ class AsyncApi(Api):
             approve: bool = True,
             reason: str = '',
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     async def get_login_info(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_login_info_ret: ...
 
     async def get_stranger_info(
@@ -877,11 +982,13 @@ class AsyncApi(Api):
             user_id: int,
             no_cache: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_stranger_info_ret: ...
 
     async def get_friend_list(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> List[_get_friend_list_ret]: ...
 
     async def get_group_info(
@@ -889,11 +996,13 @@ class AsyncApi(Api):
             group_id: int,
             no_cache: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_group_info_ret: ...
 
     async def get_group_list(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> List[_get_group_list_ret]: ...
 
     async def get_group_member_info(
@@ -902,12 +1011,14 @@ class AsyncApi(Api):
             user_id: int,
             no_cache: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_group_member_info_ret: ...
 
     async def get_group_member_list(
             self, *,
             group_id: int,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> List[_get_group_member_list_ret]: ...
 
     async def get_group_honor_info(
@@ -915,23 +1026,27 @@ class AsyncApi(Api):
             group_id: int,
             type: str,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_group_honor_info_ret: ...
 
     async def get_cookies(
             self, *,
             domain: str = '',
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_cookies_ret: ...
 
     async def get_csrf_token(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_csrf_token_ret: ...
 
     async def get_credentials(
             self, *,
             domain: str = '',
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_credentials_ret: ...
 
     async def get_record(
@@ -939,43 +1054,51 @@ class AsyncApi(Api):
             file: str,
             out_format: str,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_record_ret: ...
 
     async def get_image(
             self, *,
             file: str,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_image_ret: ...
 
     async def can_send_image(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _can_send_image_ret: ...
 
     async def can_send_record(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _can_send_record_ret: ...
 
     async def get_status(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_status_ret: ...
 
     async def get_version_info(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_version_info_ret: ...
 
     async def set_restart(
             self, *,
             delay: int = 0,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     async def clean_cache(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
 
@@ -993,6 +1116,8 @@ class SyncApi(Api):
             message: Message_T,
             auto_escape: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
+            bulk: bool = False,
     ) -> _send_private_msg_ret: ...
 
     def send_group_msg(
@@ -1001,6 +1126,8 @@ class SyncApi(Api):
             message: Message_T,
             auto_escape: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
+            bulk: bool = False,
     ) -> _send_group_msg_ret: ...
 
     def send_msg(
@@ -1011,24 +1138,29 @@ class SyncApi(Api):
             message: Message_T,
             auto_escape: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
+            bulk: bool = False,
     ) -> _send_msg_ret: ...
 
     def delete_msg(
             self, *,
             message_id: int,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     def get_msg(
             self, *,
             message_id: int,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_msg_ret: ...
 
     def get_forward_msg(
             self, *,
             id: str,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_forward_msg_ret: ...
 
     def send_like(
@@ -1036,6 +1168,7 @@ class SyncApi(Api):
             user_id: int,
             times: int = 1,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     def set_group_kick(
@@ -1044,6 +1177,7 @@ class SyncApi(Api):
             user_id: int,
             reject_add_request: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     def set_group_ban(
@@ -1052,6 +1186,7 @@ class SyncApi(Api):
             user_id: int,
             duration: int = 30 * 60,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     def set_group_anonymous_ban(
@@ -1061,6 +1196,7 @@ class SyncApi(Api):
             anonymous_flag: Optional[str] = None,
             duration: int = 30 * 60,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     def set_group_whole_ban(
@@ -1068,6 +1204,7 @@ class SyncApi(Api):
             group_id: int,
             enable: bool = True,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     def set_group_admin(
@@ -1076,6 +1213,7 @@ class SyncApi(Api):
             user_id: int,
             enable: bool = True,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     def set_group_anonymous(
@@ -1083,6 +1221,7 @@ class SyncApi(Api):
             group_id: int,
             enable: bool = True,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     def set_group_card(
@@ -1091,6 +1230,7 @@ class SyncApi(Api):
             user_id: int,
             card: str = '',
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     def set_group_name(
@@ -1098,6 +1238,7 @@ class SyncApi(Api):
             group_id: int,
             group_name: str,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     def set_group_leave(
@@ -1105,6 +1246,7 @@ class SyncApi(Api):
             group_id: int,
             is_dismiss: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     def set_group_special_title(
@@ -1114,6 +1256,7 @@ class SyncApi(Api):
             special_title: str = '',
             duration: int = -1,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     def set_friend_add_request(
@@ -1122,6 +1265,7 @@ class SyncApi(Api):
             approve: bool = True,
             remark: str = '',
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     def set_group_add_request(
@@ -1131,11 +1275,13 @@ class SyncApi(Api):
             approve: bool = True,
             reason: str = '',
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     def get_login_info(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_login_info_ret: ...
 
     def get_stranger_info(
@@ -1143,11 +1289,13 @@ class SyncApi(Api):
             user_id: int,
             no_cache: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_stranger_info_ret: ...
 
     def get_friend_list(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> List[_get_friend_list_ret]: ...
 
     def get_group_info(
@@ -1155,11 +1303,13 @@ class SyncApi(Api):
             group_id: int,
             no_cache: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_group_info_ret: ...
 
     def get_group_list(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> List[_get_group_list_ret]: ...
 
     def get_group_member_info(
@@ -1168,12 +1318,14 @@ class SyncApi(Api):
             user_id: int,
             no_cache: bool = False,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_group_member_info_ret: ...
 
     def get_group_member_list(
             self, *,
             group_id: int,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> List[_get_group_member_list_ret]: ...
 
     def get_group_honor_info(
@@ -1181,23 +1333,27 @@ class SyncApi(Api):
             group_id: int,
             type: str,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_group_honor_info_ret: ...
 
     def get_cookies(
             self, *,
             domain: str = '',
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_cookies_ret: ...
 
     def get_csrf_token(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_csrf_token_ret: ...
 
     def get_credentials(
             self, *,
             domain: str = '',
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_credentials_ret: ...
 
     def get_record(
@@ -1205,41 +1361,49 @@ class SyncApi(Api):
             file: str,
             out_format: str,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_record_ret: ...
 
     def get_image(
             self, *,
             file: str,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_image_ret: ...
 
     def can_send_image(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _can_send_image_ret: ...
 
     def can_send_record(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _can_send_record_ret: ...
 
     def get_status(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_status_ret: ...
 
     def get_version_info(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> _get_version_info_ret: ...
 
     def set_restart(
             self, *,
             delay: int = 0,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
 
     def clean_cache(
             self, *,
             self_id: Optional[int] = None,
+            timeout: Optional[float] = None,
     ) -> None: ...
@@ -3,27 +3,57 @@
 """
 
 import asyncio
+import logging
+import math
 import sys
-from typing import Callable, Dict, Any, Optional, Set, Union, Awaitable
+from typing import (Callable, Dict, Any, Hashable, Iterable, List, Optional,
+                    Set, Tuple, Union, Awaitable)
 
 from .api import Api, AsyncApi, SyncApi
-
-try:
-    import ujson as json
-except ImportError:
-    import json
+from .cache import ApiCache
+from .codec import JsonCodec
+from .latency import LatencyTracker
+from .throttle import ConcurrencyLimiter, SendScheduler
+from .ws_client import WebSocketForwardClient, current_client
 
 import httpx
 from quart import websocket as event_ws
 from quart.wrappers.websocket import Websocket
 
 from .exceptions import ActionFailed, ApiNotAvailable, HttpFailed, NetworkError
-from .utils import sync_wait
+from .utils import freeze_params, sync_wait
 
 __pdoc__ = {
     'ResultStore': False,
 }
 
+_MIN_HEDGE_DELAY_SEC = 0.05
+_MIN_ADAPTIVE_TIMEOUT_SEC = 5.0
+_ADAPTIVE_TIMEOUT_FACTOR = 4
+
+IDEMPOTENT_ACTIONS = frozenset({
+    'get_msg',
+    'get_forward_msg',
+    'get_login_info',
+    'get_stranger_info',
+    'get_friend_list',
+    'get_group_info',
+    'get_group_list',
+    'get_group_member_info',
+    'get_group_member_list',
+    'get_group_honor_info',
+    'get_cookies',
+    'get_csrf_token',
+    'get_credentials',
+    'get_record',
+    'get_image',
+    'can_send_image',
+    'can_send_record',
+    'get_status',
+    'get_version_info',
+})
+"""OneBot v11 标准中只读、可安全重复调用的 API 动作名。"""
+
 
 def _handle_api_result(result: Optional[Dict[str, Any]]) -> Any:
     """
@@ -43,31 +73,70 @@ class HttpApi(AsyncApi):
     """
     HTTP API 实现类。
 
-    实现通过 HTTP 调用 OneBot API。
+    实现通过 HTTP 调用 OneBot API。调用时可传入 ``timeout`` 参数（秒），覆盖 ``timeout_sec``。
     """
 
-    def __init__(self, api_root: Optional[str], access_token: Optional[str],
-                 timeout_sec: float):
+    def __init__(self,
+                 api_root: Optional[str],
+                 access_token: Optional[str],
+                 timeout_sec: float,
+                 *,
+                 pool_limits: Optional[Dict[str, Any]] = None,
+                 http2: bool = False,
+                 codec: Optional[JsonCodec] = None):
+        """
+        ``pool_limits`` 参数为连接池限制，将以命名参数形式传给 `httpx.Limits`，可包含
+        ``max_connections``、``max_keepalive_connections``、``keepalive_expiry``
+        等；``http2`` 参数控制是否启用 HTTP/2（需安装 ``h2``）；``codec``
+        参数为用于编解码请求和响应的 `codec.JsonCodec` 对象。
+        """
         super().__init__()
         self._api_root = api_root.rstrip('/') + '/' if api_root else None
         self._access_token = access_token
         self._timeout_sec = timeout_sec
+        self._pool_limits = pool_limits or {}
+        self._http2 = http2
+        self._codec = codec or JsonCodec()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def open(self) -> None:
+        """创建长期复用的 HTTP 客户端（连接池），重复调用不会重复创建。"""
+        if self._client is None and self._api_root:
+            headers = {'Content-Type': 'application/json'}
+            if self._access_token:
+                headers['Authorization'] = 'Bearer ' + self._access_token
+            self._client = httpx.AsyncClient(
+                headers=headers,
+                timeout=self._timeout_sec,
+                limits=httpx.Limits(**self._pool_limits),
+                http2=self._http2)
+
+    async def close(self) -> None:
+        """关闭 HTTP 客户端，释放连接池中的所有连接。"""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    def available(self, params: Dict[str, Any]) -> bool:
+        """是否可以发起参数为 ``params`` 的调用，即是否配置了 API 根地址。"""
+        return bool(self._api_root)
 
     async def call_action(self, action: str, **params) -> Any:
         if not self._api_root:
             raise ApiNotAvailable
 
-        headers = {}
-        if self._access_token:
-            headers['Authorization'] = 'Bearer ' + self._access_token
+        if self._client is None:
+            # not opened by the bot (e.g. used standalone), open lazily
+            self.open()
 
+        timeout_sec = params.pop('timeout', None) or self._timeout_sec
         try:
-            async with httpx.AsyncClient(timeout=self._timeout_sec) as client:
-                resp = await client.post(self._api_root + action,
-                                         json=params,
-                                         headers=headers)
+            resp = await self._client.post(
+                self._api_root + action,
+                content=self._codec.dumps_bytes(params),
+                timeout=timeout_sec)
             if 200 <= resp.status_code < 300:
-                return _handle_api_result(json.loads(resp.text))
+                return _handle_api_result(self._codec.loads(resp.content))
             raise HttpFailed(resp.status_code)
         except httpx.InvalidURL:
             raise NetworkError('API root url invalid')
@@ -75,40 +144,129 @@ class HttpApi(AsyncApi):
             raise NetworkError('HTTP request failed')
 
 
-class _SequenceGenerator:
-    _seq = 1
-
-    @classmethod
-    def next(cls) -> int:
-        s = cls._seq
-        cls._seq = (cls._seq + 1) % sys.maxsize
-        return s
+class ResultStore:
+    """
+    保存等待中的 WebSocket API 调用，每个 `WebSocketReverseApi` 对象各自持有一个。
 
+    所有等待中调用的超时由一个定时轮统一处理：超时时刻按 ``resolution_sec``（默认 0.1 秒）
+    分桶，只需一个定时器周期性地使到期桶中的调用失败，而不必为每个调用创建定时器，超时的精度即为
+    ``resolution_sec``。
 
-class ResultStore:
-    _futures: Dict[int, asyncio.Future] = {}
+    调用按发出请求的连接分组记录，连接断开时可使其上的调用立即失败。
+    """
 
-    @classmethod
-    def add(cls, result: Dict[str, Any]):
+    def __init__(self, resolution_sec: float = 0.1):
+        self._resolution = resolution_sec
+        self._seq = 1
+        self._futures: Dict[int, Tuple[asyncio.Future, int, Any]] = {}
+        self._wheel: Dict[int, Set[int]] = {}  # tick -> seqs expiring at it
+        self._connections: Dict[Any, Set[int]] = {}  # conn -> pending seqs
+        self._last_tick = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def pending(self, conn: Any) -> int:
+        """在连接 ``conn`` 上发出、仍在等待结果的 API 调用数。"""
+        return len(self._connections.get(conn, ()))
+
+    def register(self, timeout_sec: float, conn: Any = None) -> int:
+        """登记一个在连接 ``conn`` 上发出的 API 调用，返回其序列号。"""
+        seq = self._seq
+        self._seq = (self._seq + 1) % sys.maxsize or 1
+
+        loop = asyncio.get_running_loop()
+        if self._timer is None:
+            self._last_tick = math.floor(loop.time() / self._resolution)
+            self._timer = loop.call_at(
+                (self._last_tick + 1) * self._resolution, self._tick)
+        tick = max(math.ceil((loop.time() + timeout_sec) / self._resolution),
+                   self._last_tick + 1)
+        self._futures[seq] = (loop.create_future(), tick, conn)
+        self._wheel.setdefault(tick, set()).add(seq)
+        self._connections.setdefault(conn, set()).add(seq)
+        return seq
+
+    def discard(self, seq: int) -> None:
+        """移除登记的 API 调用。"""
+        _, tick, conn = self._futures.pop(seq, (None, None, None))
+        for index, key in ((self._wheel, tick), (self._connections, conn)):
+            seqs = index.get(key)
+            if seqs is not None:
+                seqs.discard(seq)
+                if not seqs:
+                    del index[key]
+
+    def fail_connection(self, conn: Any, exc: BaseException) -> None:
+        """使在连接 ``conn`` 上发出、仍在等待结果的 API 调用以 ``exc`` 失败。"""
+        for seq in self._connections.get(conn, ()):
+            future = self._futures[seq][0]
+            if not future.done():
+                future.set_exception(exc)
+
+    def add(self, result: Dict[str, Any]) -> None:
         if isinstance(result.get('echo'), dict) and \
                 isinstance(result['echo'].get('seq'), int):
-            future = cls._futures.get(result['echo']['seq'])
-            if future:
+            future, _, _ = self._futures.get(result['echo']['seq'],
+                                             (None, None, None))
+            if future and not future.done():
                 future.set_result(result)
 
-    @classmethod
-    async def fetch(cls, seq: int, timeout_sec: float) -> Dict[str, Any]:
-        future = asyncio.get_event_loop().create_future()
-        cls._futures[seq] = future
+    async def send_and_fetch(self, conn: Any, codec: JsonCodec, action: str,
+                             params: Dict[str, Any],
+                             timeout_sec: float) -> Dict[str, Any]:
+        """
+        在连接 ``conn`` 上发出 API 调用并等待其结果，``conn`` 应有异步的 ``send`` 方法。
+
+        请求没能发出时抛出 `exceptions.ApiNotAvailable`，以便改用其它通信方式。
+        """
+        # register before sending, so that a quick result won't be missed
+        seq = self.register(timeout_sec, conn)
+        try:
+            await conn.send(
+                codec.dumps({
+                    'action': action,
+                    'params': params,
+                    'echo': {
+                        'seq': seq
+                    }
+                }))
+        except Exception as e:
+            # the request never left, so other transports may take it
+            self.discard(seq)
+            raise ApiNotAvailable from e
+        except BaseException:
+            self.discard(seq)
+            raise
+        return await self.fetch(seq)
+
+    async def fetch(self, seq: int) -> Dict[str, Any]:
+        """等待并返回登记的 API 调用的结果。"""
         try:
-            return await asyncio.wait_for(future, timeout_sec)
-        except asyncio.TimeoutError:
-            # haven't received any result until timeout,
-            # we consider this API call failed with a network error.
-            raise NetworkError('WebSocket API call timeout')
+            return await self._futures[seq][0]
         finally:
             # don't forget to remove the future object
-            del cls._futures[seq]
+            self.discard(seq)
+
+    def _tick(self) -> None:
+        loop = asyncio.get_running_loop()
+        current = math.floor(loop.time() / self._resolution)
+        for tick in range(self._last_tick + 1, current + 1):
+            for seq in self._wheel.pop(tick, ()):
+                future = self._futures[seq][0]
+                if not future.done():
+                    # haven't received any result until timeout,
+                    # we consider this API call failed with a network error.
+                    future.set_exception(
+                        NetworkError('WebSocket API call timeout'))
+        self._last_tick = max(self._last_tick, current)
+
+        if self._futures:
+            self._timer = loop.call_at(
+                (self._last_tick + 1) * self._resolution, self._tick)
+        else:
+            self._timer = None
 
 
 class WebSocketReverseApi(AsyncApi):
@@ -116,81 +274,404 @@ class WebSocketReverseApi(AsyncApi):
     反向 WebSocket API 实现类。
 
     实现通过反向 WebSocket 调用 OneBot API。
+
+    同一机器人账号可以有多个 API 连接，每次调用选择等待中的调用最少的连接。调用时可传入 ``timeout``
+    参数（秒），覆盖 ``timeout_sec``。
     """
 
-    def __init__(self, connected_api_clients: Dict[str, Websocket],
+    def __init__(self, connected_api_clients: Dict[str, List[Websocket]],
                  connected_event_clients: Set[Websocket],
-                 timeout_sec: float):
+                 timeout_sec: float,
+                 codec: Optional[JsonCodec] = None):
         super().__init__()
         self._api_clients = connected_api_clients
         self._event_clients = connected_event_clients
         self._timeout_sec = timeout_sec
+        self._result_store = ResultStore()
+        self._codec = codec or JsonCodec()
 
-    async def call_action(self, action: str, **params) -> Any:
-        api_ws = None
+    def add_result(self, result: Dict[str, Any]) -> None:
+        """接收从 WebSocket 连接收到的 API 调用结果。"""
+        self._result_store.add(result)
+
+    def connection_closed(self, api_ws: Websocket) -> None:
+        """WebSocket 连接断开时调用，使该连接上等待中的 API 调用立即失败。"""
+        self._result_store.fail_connection(
+            api_ws, NetworkError('WebSocket API connection closed'))
+
+    def _choose_connection(self,
+                           params: Dict[str, Any]) -> Optional[Websocket]:
+        api_wss = None
         if params.get('self_id'):
             # 明确指定
-            api_ws = self._api_clients.get(str(params['self_id']))
+            api_wss = self._api_clients.get(str(params['self_id']))
         elif event_ws and event_ws in self._event_clients:
             # 没有指定，但在事件处理函数中
-            api_ws = self._api_clients.get(event_ws.headers['X-Self-ID'])
+            api_wss = self._api_clients.get(event_ws.headers['X-Self-ID'])
         elif len(self._api_clients) == 1:
-            # 没有指定，不在事件处理函数中，但只有一个连接
-            api_ws = tuple(self._api_clients.values())[0]
+            # 没有指定，不在事件处理函数中，但只有一个账号
+            api_wss = tuple(self._api_clients.values())[0]
 
-        if not api_ws:
+        if not api_wss:
+            return None
+        if len(api_wss) == 1:
+            return api_wss[0]
+        return min(api_wss, key=self._result_store.pending)
+
+    def available(self, params: Dict[str, Any]) -> bool:
+        """是否有可用于发起参数为 ``params`` 的调用的连接。"""
+        return self._choose_connection(params) is not None
+
+    async def call_action(self, action: str, **params) -> Any:
+        api_ws = self._choose_connection(params)
+        if api_ws is None:
             raise ApiNotAvailable
 
-        seq = _SequenceGenerator.next()
-        await api_ws.send(
-            json.dumps({
-                'action': action,
-                'params': params,
-                'echo': {
-                    'seq': seq
-                }
-            }))
-        return _handle_api_result(await
-                                  ResultStore.fetch(seq, self._timeout_sec))
+        timeout_sec = params.pop('timeout', None) or self._timeout_sec
+        return _handle_api_result(await self._result_store.send_and_fetch(
+            api_ws, self._codec, action, params, timeout_sec))
+
+
+class WebSocketForwardApi(AsyncApi):
+    """
+    正向 WebSocket API 实现类。
+
+    主动连接 ``urls`` 参数中的每个 OneBot 正向 WebSocket 服务（Universal 端点），保持长连接，
+    断开后自动重连。API 调用通过 ``echo`` 字段匹配结果，同一连接上可以同时进行多个调用。连接上收到的事件交给
+    ``on_event`` 协程函数处理，处理期间 `ws_client.current_client` 为收到事件的连接。
+
+    调用的路由方式与 `WebSocketReverseApi` 相同：指定了 ``self_id``
+    时使用该账号的连接（有多个时选择等待中的调用最少的），否则使用收到当前事件的连接，或只有一个连接时使用该连接。
+    调用时可传入 ``timeout`` 参数（秒），覆盖 ``timeout_sec``。
+    """
+
+    def __init__(self,
+                 urls: Iterable[str],
+                 access_token: Optional[str],
+                 timeout_sec: float,
+                 *,
+                 on_event: Optional[Callable[[Dict[str, Any]],
+                                             Awaitable[Any]]] = None,
+                 codec: Optional[JsonCodec] = None,
+                 logger: Optional[logging.Logger] = None):
+        super().__init__()
+        headers = {'Authorization': 'Bearer ' + access_token} \
+            if access_token else {}
+        self._clients = [
+            WebSocketForwardClient(url,
+                                   on_message=self._on_message,
+                                   on_disconnect=self._on_disconnect,
+                                   headers=headers,
+                                   logger=logger) for url in urls
+        ]
+        self._timeout_sec = timeout_sec
+        self._on_event = on_event
+        self._result_store = ResultStore()
+        self._codec = codec or JsonCodec()
+
+    @property
+    def clients(self) -> List[WebSocketForwardClient]:
+        """所有连接的 `ws_client.WebSocketForwardClient` 对象。"""
+        return self._clients
+
+    def open(self) -> None:
+        """在后台开始连接所有 OneBot 实例。"""
+        for client in self._clients:
+            client.start()
+
+    async def close(self) -> None:
+        """断开所有连接，并停止重连。"""
+        await asyncio.gather(*(client.close() for client in self._clients))
+
+    async def _on_message(self, client: WebSocketForwardClient,
+                          data: Union[str, bytes]) -> None:
+        try:
+            payload = self._codec.loads(data)
+        except ValueError:
+            return
+        if not isinstance(payload, dict):
+            return
+
+        if 'post_type' in payload:
+            if payload.get('self_id') is not None:
+                client.self_id = str(payload['self_id'])
+            if self._on_event is not None:
+                token = current_client.set(client)
+                try:
+                    await self._on_event(payload)
+                finally:
+                    current_client.reset(token)
+        elif payload:
+            self._result_store.add(payload)
+
+    def _on_disconnect(self, client: WebSocketForwardClient) -> None:
+        self._result_store.fail_connection(
+            client, NetworkError('WebSocket API connection closed'))
+
+    def _choose_client(
+            self, params: Dict[str, Any]) -> Optional[WebSocketForwardClient]:
+        if params.get('self_id'):
+            self_id = str(params['self_id'])
+            candidates = [
+                c for c in self._clients
+                if c.connected and c.self_id == self_id
+            ]
+        else:
+            client = current_client.get()
+            if client is not None:
+                return client if client.connected else None
+            candidates = [c for c in self._clients if c.connected]
+            if len(candidates) > 1:
+                return None
+        if not candidates:
+            return None
+        return min(candidates, key=self._result_store.pending)
+
+    def available(self, params: Dict[str, Any]) -> bool:
+        """是否有可用于发起参数为 ``params`` 的调用的连接。"""
+        return self._choose_client(params) is not None
+
+    async def call_action(self, action: str, **params) -> Any:
+        client = self._choose_client(params)
+        if client is None:
+            raise ApiNotAvailable
+
+        timeout_sec = params.pop('timeout', None) or self._timeout_sec
+        return _handle_api_result(await self._result_store.send_and_fetch(
+            client, self._codec, action, params, timeout_sec))
 
 
 class UnifiedApi(AsyncApi):
     """
     统一 API 实现类。
 
-    同时维护 `HttpApi` 和 `WebSocketReverseApi` 对象，根据可用情况，选择两者中的某个使用。
+    同时维护 `HttpApi`、`WebSocketReverseApi` 和 `WebSocketForwardApi` 对象，根据可用情况，
+    依次选择反向 WebSocket、正向 WebSocket、HTTP 中的某个使用。
+
+    传入 ``cache`` 参数时，其中配置的 API 的调用结果将按机器人账号分别缓存；调用时可传入
+    ``no_cache=True`` 跳过缓存，直接调用 API 并更新缓存，该参数仍会传给 OneBot。
+
+    对于 ``coalesce_actions`` 参数中的 API，同时发起的动作名和参数都相同的调用将合并为一次请求，
+    所有调用者得到同一个结果。
+
+    传入 ``scheduler`` 参数时，发送消息的 API 调用将按其限流；调用时可传入 ``bulk=True``
+    表示批量发送，优先级低于普通发送。
+
+    对于 ``hedge_actions`` 参数中的 API（应只包含可安全重复调用的 API），若 WebSocket
+    调用在该 API 近期 WebSocket 调用延迟的 95 分位数（样本不足时为 ``hedge_delay_sec``）内没有返回，或连接断开，
+    将同时通过 HTTP 发起相同的调用，采用先返回的结果并取消另一个。其它 API 只在请求没能发出时
+    （如 WebSocket 连接不可用或发送失败）改用下一种方式，超时等错误直接抛出，以免重复执行。
+
+    调用的超时时间依次取调用时传入的 ``timeout`` 参数（秒）、``timeouts`` 参数中该 API
+    的超时时间；都没有时，若传入了 ``adaptive_timeout_sec`` 参数，则取该 API 近期延迟的 99 分位数的
+    4 倍（不少于 5 秒，不超过 ``adaptive_timeout_sec``），否则使用各通信方式的默认超时时间。WebSocket
+    调用的超时由定时轮处理，精度约为 0.1 秒。
+
+    传入 ``limiter`` 参数时，每次通过各通信方式发出的调用都受其对所属机器人账号的并发限制，
+    并将调用的延迟和网络错误反馈给它，见 `throttle.ConcurrencyLimiter`；当时没有可用连接的通信方式会被直接跳过，
+    不占用并发名额。
     """
 
     def __init__(self,
                  http_api: Optional[AsyncApi] = None,
-                 wsr_api: Optional[AsyncApi] = None):
+                 wsr_api: Optional[AsyncApi] = None,
+                 cache: Optional[ApiCache] = None,
+                 coalesce_actions: Iterable[str] = (),
+                 scheduler: Optional[SendScheduler] = None,
+                 wsf_api: Optional[AsyncApi] = None,
+                 hedge_actions: Iterable[str] = (),
+                 hedge_delay_sec: float = 1.0,
+                 timeouts: Optional[Dict[str, float]] = None,
+                 adaptive_timeout_sec: Optional[float] = None,
+                 limiter: Optional[ConcurrencyLimiter] = None):
         super().__init__()
         self._http_api = http_api
         self._wsr_api = wsr_api
+        self._wsf_api = wsf_api
+        self._cache = cache
+        self._coalesce_actions = frozenset(coalesce_actions)
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._scheduler = scheduler
+        self._hedge_actions = frozenset(hedge_actions)
+        self._hedge_delay_sec = hedge_delay_sec
+        self._timeouts = dict(timeouts or {})
+        self._adaptive_timeout_sec = adaptive_timeout_sec
+        self._latency = LatencyTracker()  # all transports, for timeouts
+        self._ws_latency = LatencyTracker()  # WebSocket only, for hedging
+        self._limiter = limiter
+
+    @staticmethod
+    def _self_id_of(params: Dict[str, Any]) -> Optional[Any]:
+        # calls without explicit self_id are routed by the current event
+        if params.get('self_id'):
+            return params['self_id']
+        if event_ws:
+            return event_ws.headers.get('X-Self-ID')
+        client = current_client.get()
+        return client.self_id if client is not None else None
 
     async def call_action(self, action: str, **params) -> Any:
-        result = None
-        succeeded = False
-
-        if self._wsr_api:
-            # WebSocket is preferred
-            try:
-                result = await self._wsr_api.call_action(action, **params)
-                succeeded = True
-            except ApiNotAvailable:
-                pass
+        bulk = params.pop('bulk', False)
+        timeout = params.pop('timeout', None)
+        scheduler = self._scheduler
+        if scheduler is not None and action in scheduler.actions:
+            await scheduler.acquire(self._self_id_of(params),
+                                    scheduler.target_group(action, params),
+                                    bulk=bulk)
+
+        cache = self._cache
+        if cache is None or action not in cache:
+            return await self._call_coalesced(action, timeout, params)
+
+        # no_cache is also understood by OneBot, so it is still sent along
+        key_params = {k: v for k, v in params.items() if k != 'no_cache'}
+        # results of calls without self_id depend on the routed account
+        self_id = self._self_id_of(params)
+        if not params.get('no_cache'):
+            hit, result = cache.get(action, key_params, self_id)
+            if hit:
+                return result
+
+        generation = cache.generation(action)
+        result = await self._call_coalesced(action, timeout, params)
+        cache.put(action, key_params, result, generation, self_id)
+        return result
 
-        if not succeeded and self._http_api:
+    async def _call_coalesced(self, action: str, timeout: Optional[float],
+                              params: Dict[str, Any]) -> Any:
+        key = None
+        if action in self._coalesce_actions:
+            self_id = self._self_id_of(params)
+            key = freeze_params(params)
+        if key is None:
+            return await self._call_action(action, timeout, params)
+
+        key = (action, self_id, key)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._call_action(action, timeout, params))
+            self._inflight[key] = task
+
+            def on_done(t: asyncio.Task) -> None:
+                if self._inflight.get(key) is t:
+                    del self._inflight[key]
+                if not t.cancelled():
+                    t.exception()  # mark retrieved even if nobody waits
+
+            task.add_done_callback(on_done)
+        # a waiter being cancelled must not cancel the shared call
+        return await asyncio.shield(task)
+
+    def _timeout_of(self, action: str) -> Optional[float]:
+        timeout = self._timeouts.get(action)
+        if timeout is None and self._adaptive_timeout_sec:
+            p99 = self._latency.quantile(action, 0.99)
+            if p99 is not None:
+                timeout = min(
+                    max(p99 * _ADAPTIVE_TIMEOUT_FACTOR,
+                        _MIN_ADAPTIVE_TIMEOUT_SEC), self._adaptive_timeout_sec)
+        return timeout
+
+    async def _call_action(self, action: str, timeout: Optional[float],
+                           params: Dict[str, Any]) -> Any:
+        timeout = timeout or self._timeout_of(action)
+        if timeout:
+            params = {**params, 'timeout': timeout}
+        if action in self._hedge_actions:
+            return await self._call_hedged(action, params)
+        try:
+            return await self._call_ws(action, params)
+        except ApiNotAvailable:
+            pass
+        if self._http_api:
+            return await self._call_observed(self._http_api, action, params)
+        raise ApiNotAvailable
+
+    async def _call_ws(self, action: str, params: Dict[str, Any]) -> Any:
+        # reverse WebSocket is preferred
+        for api in (self._wsr_api, self._wsf_api):
+            if not api:
+                continue
             try:
-                result = await self._http_api.call_action(action, **params)
-                succeeded = True
+                return await self._call_observed(api, action, params)
             except ApiNotAvailable:
-                pass
-
-        if not succeeded:
+                continue
+        raise ApiNotAvailable
+
+    async def _call_observed(self, api: AsyncApi, action: str,
+                             params: Dict[str, Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        limiter = self._limiter
+        # looked up on the class, as Api.__getattr__ turns any name into a call
+        available = getattr(type(api), 'available', None)
+        if available is not None and not available(api, params):
+            # fail before taking a slot, so it is not held for nothing
             raise ApiNotAvailable
+        if limiter is not None:
+            self_id = self._self_id_of(params)
+            start = await limiter.acquire(self_id)
+        else:
+            start = loop.time()
+        latency = None
+        congested = False
+        try:
+            result = await api.call_action(action, **params)
+            latency = loop.time() - start
+        except ActionFailed:
+            # a failed result is still a response
+            latency = loop.time() - start
+            raise
+        except NetworkError:
+            congested = True
+            raise
+        finally:
+            if limiter is not None:
+                limiter.release(self_id, start, action, latency, congested)
+            if latency is not None:
+                self._latency.observe(action, latency)
+                if api is not self._http_api:
+                    self._ws_latency.observe(action, latency)
         return result
 
+    async def _call_hedged(self, action: str, params: Dict[str, Any]) -> Any:
+        ws_task = asyncio.ensure_future(self._call_ws(action, params))
+        http_task = None
+        try:
+            if self._http_api:
+                delay = self._ws_latency.quantile(action, 0.95)
+                delay = self._hedge_delay_sec if delay is None \
+                    else max(delay, _MIN_HEDGE_DELAY_SEC)
+                await asyncio.wait((ws_task,), timeout=delay)
+                if not ws_task.done() or isinstance(
+                        ws_task.exception(), (ApiNotAvailable, NetworkError)):
+                    # slow or broken WebSocket, race it against HTTP
+                    http_task = asyncio.ensure_future(
+                        self._call_observed(self._http_api, action, params))
+
+            pending = {ws_task, http_task} - {None}
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+
+            # both failed, prefer the error that is not about availability
+            if http_task is None or not isinstance(ws_task.exception(),
+                                                   ApiNotAvailable):
+                raise ws_task.exception()
+            raise http_task.exception()
+        finally:
+            for task in (ws_task, http_task):
+                if task is None:
+                    continue
+                if task.done():
+                    if not task.cancelled():
+                        task.exception()  # mark retrieved
+                else:
+                    task.cancel()
+
 
 class SyncWrapperApi(SyncApi):
     """
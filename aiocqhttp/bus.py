@@ -2,31 +2,54 @@
 此模块提供事件总线相关类。
 """
 
-from collections import defaultdict
-from typing import Callable, List, Any
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any
 
 from .utils import run_async_funcs
 
+_Chain = Tuple[Tuple[Callable, ...], ...]
+
+# cached dispatch chains are dropped all at once beyond this number,
+# so that arbitrary event names can't grow the cache without bound
+_MAX_CACHED_CHAINS = 1024
+
 
 class EventBus:
 
     def __init__(self):
-        self._subscribers = defaultdict(set)
-        self._hooks_before = defaultdict(set)
+        self._subscribers: Dict[str, Set[Callable]] = {}
+        self._hooks_before: Dict[str, Set[Callable]] = {}
+        # event name -> (before hooks, handlers), each grouped by level
+        self._chains: Dict[str, Tuple[_Chain, _Chain]] = {}
+
+    @staticmethod
+    def _add(registry: Dict[str, Set[Callable]], event: str,
+             func: Callable) -> None:
+        registry.setdefault(event, set()).add(func)
+
+    @staticmethod
+    def _remove(registry: Dict[str, Set[Callable]], event: str,
+                func: Callable) -> None:
+        funcs = registry.get(event)
+        if funcs and func in funcs:
+            funcs.remove(func)
+            if not funcs:
+                del registry[event]
 
     def subscribe(self, event: str, func: Callable) -> None:
-        self._subscribers[event].add(func)
+        self._add(self._subscribers, event, func)
+        self._chains.clear()
 
     def unsubscribe(self, event: str, func: Callable) -> None:
-        if func in self._subscribers[event]:
-            self._subscribers[event].remove(func)
+        self._remove(self._subscribers, event, func)
+        self._chains.clear()
 
     def hook_before(self, event: str, func: Callable) -> None:
-        self._hooks_before[event].add(func)
+        self._add(self._hooks_before, event, func)
+        self._chains.clear()
 
     def unhook_before(self, event: str, func: Callable) -> None:
-        if func in self._hooks_before[event]:
-            self._hooks_before[event].remove(func)
+        self._remove(self._hooks_before, event, func)
+        self._chains.clear()
 
     def on(self, event: str) -> Callable:
 
@@ -44,23 +67,57 @@ class EventBus:
 
         return decorator
 
+    def _get_chain(self, event: str) -> Tuple[_Chain, _Chain]:
+        chain = self._chains.get(event)
+        if chain is None:
+            # from the event itself up to the root event,
+            # e.g. 'message.private.friend', 'message.private', 'message'
+            names = [event]
+            while '.' in event:
+                event = event.rsplit('.', maxsplit=1)[0]
+                names.append(event)
+
+            chain = tuple(
+                tuple(
+                    tuple(registry[name])
+                    for name in names
+                    if name in registry)
+                for registry in (self._hooks_before, self._subscribers))
+            if len(self._chains) >= _MAX_CACHED_CHAINS:
+                self._chains.clear()
+            self._chains[names[0]] = chain
+        return chain
+
     async def emit(self, event: str, *args, **kwargs) -> List[Any]:
-        event_copy = event
+        return await self.emit_each(event, None, *args, **kwargs)
+
+    async def emit_each(self, event: str,
+                        callback: Optional[Callable[[Any], None]], *args,
+                        **kwargs) -> List[Any]:
+        """
+        与 `emit` 相同，但每个处理函数返回后立即以其返回值调用 ``callback``，
+        而不必等待所有处理函数运行完成。
+        """
+        hooks, handlers = self._get_chain(event)
+
+        for funcs in hooks:
+            await run_async_funcs(funcs, *args, **kwargs)
+
+        if callback is not None:
+
+            def notifying(func: Callable) -> Callable:
+
+                async def wrapper(*args, **kwargs) -> Any:
+                    result = await func(*args, **kwargs)
+                    callback(result)
+                    return result
+
+                return wrapper
 
-        while True:
-            await run_async_funcs(self._hooks_before[event], *args, **kwargs)
-            event, *sub_event = event.rsplit('.', maxsplit=1)
-            if not sub_event:
-                # the current event is the root event
-                break
-        event = event_copy
+            handlers = tuple(
+                tuple(map(notifying, funcs)) for funcs in handlers)
 
         results = []
-        while True:
-            results += await run_async_funcs(self._subscribers[event], *args,
-                                             **kwargs)
-            event, *sub_event = event.rsplit('.', maxsplit=1)
-            if not sub_event:
-                # the current event is the root event
-                break
+        for funcs in handlers:
+            results += await run_async_funcs(funcs, *args, **kwargs)
         return results
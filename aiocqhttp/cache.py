@@ -0,0 +1,166 @@
+"""
+此模块提供了 OneBot API 调用结果缓存相关类。
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .event import Event
+from .typing import CachePolicy_T
+from .utils import freeze_params
+
+__all__ = [
+    'ApiCache',
+]
+
+# notice type -> actions whose results become stale, with the fields
+# (shared by the event and the API params) that select the stale ones
+_INVALIDATIONS = {
+    'group_increase': (
+        ('get_group_member_info', ('group_id', 'user_id')),
+        ('get_group_member_list', ('group_id',)),
+        ('get_group_info', ('group_id',)),
+        ('get_group_list', ()),
+    ),
+    'group_decrease': (
+        ('get_group_member_info', ('group_id', 'user_id')),
+        ('get_group_member_list', ('group_id',)),
+        ('get_group_info', ('group_id',)),
+        ('get_group_list', ()),
+    ),
+    'group_card': (
+        ('get_group_member_info', ('group_id', 'user_id')),
+        ('get_group_member_list', ('group_id',)),
+    ),
+    'group_admin': (
+        ('get_group_member_info', ('group_id', 'user_id')),
+        ('get_group_member_list', ('group_id',)),
+    ),
+    'friend_add': (
+        ('get_stranger_info', ('user_id',)),
+        ('get_friend_list', ()),
+    ),
+}
+
+
+class ApiCache:
+    """
+    只读 OneBot API 调用结果的缓存。
+
+    ``policies`` 参数为要缓存的 API 动作名到缓存策略的映射，策略为有效期秒数，或
+    ``(有效期秒数, 容量)`` 元组，不指定容量时使用 ``maxsize`` 参数。每个动作的缓存超出容量时，
+    淘汰最久未使用的结果。例如：
+
+    ```py
+    ApiCache({
+        'get_group_member_info': 300,
+        'get_group_list': (60, 16),
+    })
+    ```
+
+    收到群成员增减、群名片变更、群管理员变动、好友添加等通知事件时，应调用
+    `invalidate_by_event`，使相关的缓存失效。
+
+    注意，缓存的调用结果会被多次返回，请勿修改。
+    """
+
+    def __init__(self,
+                 policies: Dict[str, CachePolicy_T],
+                 maxsize: int = 1024):
+        self._policies: Dict[str, Tuple[float, int]] = {
+            action: policy if isinstance(policy, tuple) else (policy, maxsize)
+            for action, policy in policies.items()
+        }
+        self._entries: Dict[str, OrderedDict] = {
+            action: OrderedDict() for action in self._policies
+        }
+        self._generations: Dict[str, int] = dict.fromkeys(self._policies, 0)
+
+    def __contains__(self, action: str) -> bool:
+        """判断是否缓存动作 ``action`` 的调用结果。"""
+        return action in self._policies
+
+    def generation(self, action: str) -> int:
+        """动作 ``action`` 的缓存失效次数，用于 `put` 判断调用结果是否已过时。"""
+        return self._generations[action]
+
+    @staticmethod
+    def _key(params: Dict[str, Any],
+             self_id: Optional[Any]) -> Optional[Hashable]:
+        key = freeze_params(params)
+        if key is None:
+            return None
+        return str(self_id) if self_id is not None else None, key
+
+    def get(self,
+            action: str,
+            params: Dict[str, Any],
+            self_id: Optional[Any] = None) -> Tuple[bool, Any]:
+        """
+        获取机器人账号 ``self_id`` 缓存的调用结果，返回 ``(是否命中, 结果)``。
+        """
+        key = self._key(params, self_id)
+        entries = self._entries[action]
+        entry = entries.get(key) if key is not None else None
+        if entry is None:
+            return False, None
+        if entry[0] <= time.monotonic():
+            del entries[key]
+            return False, None
+        entries.move_to_end(key)
+        return True, entry[2]
+
+    def put(self,
+            action: str,
+            params: Dict[str, Any],
+            result: Any,
+            generation: Optional[int] = None,
+            self_id: Optional[Any] = None) -> None:
+        """
+        缓存机器人账号 ``self_id`` 的调用结果。若传入调用开始时的 ``generation``，且期间缓存已失效，则不缓存。
+        """
+        if generation is not None and \
+                generation != self._generations[action]:
+            return
+        key = self._key(params, self_id)
+        if key is None:
+            return
+        ttl, maxsize = self._policies[action]
+        entries = self._entries[action]
+        entries[key] = (time.monotonic() + ttl, params, result)
+        entries.move_to_end(key)
+        while len(entries) > maxsize:
+            entries.popitem(last=False)
+
+    def invalidate(self, action: str, **match) -> None:
+        """
+        使动作 ``action`` 中参数与 ``match`` 相符的缓存失效，不传入 ``match`` 则全部失效。
+        """
+        entries = self._entries.get(action)
+        if entries is None:
+            return
+        self._generations[action] += 1
+        if not match:
+            entries.clear()
+            return
+        match = {k: str(v) for k, v in match.items()}
+        for key in [
+                key for key, (_, params, _) in entries.items()
+                if all(str(params.get(k)) == v for k, v in match.items())
+        ]:
+            del entries[key]
+
+    def invalidate_by_event(self, event: Event) -> None:
+        """根据事件使相关的缓存失效。"""
+        if event.type != 'notice':
+            return
+        for action, fields in _INVALIDATIONS.get(event.detail_type, ()):
+            self.invalidate(action,
+                            **{f: event[f] for f in fields if f in event})
+
+    def clear(self) -> None:
+        """清空所有缓存。"""
+        for action, entries in self._entries.items():
+            self._generations[action] += 1
+            entries.clear()
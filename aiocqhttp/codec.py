@@ -0,0 +1,154 @@
+"""
+此模块提供了 JSON 编解码相关类。
+"""
+
+import functools
+import json
+import uuid
+from typing import Any, List, Optional, Union
+
+__all__ = [
+    'JsonCodec',
+    'RawJson',
+]
+
+# RawJson objects are encoded as this placeholder followed by their index,
+# and spliced in afterwards; the random part keeps it from clashing with
+# real strings
+_PLACEHOLDER = f'aiocqhttp-raw-json-{uuid.uuid4().hex}-'
+
+
+class RawJson:
+    """
+    已编码的 JSON 片段。`JsonCodec` 编码包含此对象的数据时，直接原样拼接其内容，不再重复编码，
+    例如：
+
+    ```py
+    message = codec.raw(Message('公告内容'))
+    for group_id in group_ids:
+        await bot.send_group_msg(group_id=group_id, message=message)
+    ```
+
+    注意，只有通过 `JsonCodec` 编码时才能识别此对象。
+    """
+
+    __slots__ = ('_encoded', '_text')
+
+    def __init__(self, encoded: Union[str, bytes]):
+        """``encoded`` 参数为合法的 JSON 字符串或 UTF-8 字节串。"""
+        if isinstance(encoded, str):
+            self._text = encoded
+            self._encoded = encoded.encode('utf-8')
+        else:
+            self._text = None
+            self._encoded = encoded
+
+    @property
+    def encoded(self) -> bytes:
+        """UTF-8 编码的 JSON 字节串。"""
+        return self._encoded
+
+    @property
+    def text(self) -> str:
+        """JSON 字符串。"""
+        if self._text is None:
+            self._text = self._encoded.decode('utf-8')
+        return self._text
+
+    def __repr__(self) -> str:
+        return f'<RawJson {self.text}>'
+
+
+class JsonCodec:
+    """
+    JSON 编解码器，统一用于 HTTP 上报事件的解析、WebSocket 的收发和 HTTP API 的请求。
+
+    ``name`` 参数可选 ``orjson``、``ujson``、``json``（标准库），不传入则按此顺序选择第一个
+    已安装且可用的库。``ujson`` 需 5.2 以上版本（支持 ``default`` 参数），较旧的版本不会被自动选择，
+    明确指定时抛出 ``ImportError``。
+
+    编码的数据中可以包含 `RawJson` 对象，其内容将原样拼接到结果中。
+    """
+
+    preferred = ('orjson', 'ujson', 'json')
+
+    def __init__(self, name: Optional[str] = None):
+        candidates = (name,) if name else self.preferred
+        for name in candidates:
+            try:
+                backend = json if name == 'json' else __import__(name)
+                if name == 'ujson':
+                    self._check_ujson(backend)
+                break
+            except ImportError:
+                if len(candidates) == 1:
+                    raise
+        self._name = name
+
+        self._loads = backend.loads
+        if name == 'orjson':
+            self._dumps_bytes = functools.partial(
+                backend.dumps, option=backend.OPT_NON_STR_KEYS)
+            self._dumps = None
+        elif name == 'ujson':
+            self._dumps = functools.partial(backend.dumps, ensure_ascii=False)
+            self._dumps_bytes = None
+        else:
+            self._dumps = functools.partial(backend.dumps,
+                                            ensure_ascii=False,
+                                            separators=(',', ':'))
+            self._dumps_bytes = None
+
+    @staticmethod
+    def _check_ujson(backend: Any) -> None:
+        # RawJson splicing relies on default=, added in ujson 5.2
+        try:
+            backend.dumps(RawJson('null'), default=lambda o: None)
+        except TypeError:
+            raise ImportError('ujson>=5.2 is required for the default hook')
+
+    @property
+    def name(self) -> str:
+        """实际使用的 JSON 库名。"""
+        return self._name
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """解码 JSON 字符串或 UTF-8 字节串，失败时抛出 ``ValueError``。"""
+        return self._loads(data)
+
+    def _encode(self, obj: Any) -> Union[str, bytes]:
+        fragments: List[RawJson] = []
+
+        def default(o: Any) -> str:
+            if isinstance(o, RawJson):
+                fragments.append(o)
+                return _PLACEHOLDER + str(len(fragments) - 1)
+            raise TypeError(
+                f'Object of type {type(o).__name__} is not JSON serializable')
+
+        if self._dumps is None:
+            data = self._dumps_bytes(obj, default=default)
+            for i, fragment in enumerate(fragments):
+                data = data.replace(f'"{_PLACEHOLDER}{i}"'.encode(),
+                                    fragment.encoded, 1)
+        else:
+            data = self._dumps(obj, default=default)
+            for i, fragment in enumerate(fragments):
+                data = data.replace(f'"{_PLACEHOLDER}{i}"', fragment.text, 1)
+        return data
+
+    def dumps(self, obj: Any) -> str:
+        """将对象编码为 JSON 字符串。"""
+        data = self._encode(obj)
+        return data.decode('utf-8') if isinstance(data, bytes) else data
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """将对象编码为 UTF-8 编码的 JSON 字节串。"""
+        data = self._encode(obj)
+        return data.encode('utf-8') if isinstance(data, str) else data
+
+    def raw(self, obj: Any) -> RawJson:
+        """将对象编码为 `RawJson`，之后可多次编码而不必重复序列化。"""
+        if isinstance(obj, RawJson):
+            return obj
+        return RawJson(self.dumps_bytes(obj))
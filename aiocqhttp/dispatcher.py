@@ -0,0 +1,238 @@
+"""
+此模块提供了事件调度相关类。
+"""
+
+import asyncio
+import contextvars
+import logging
+from collections import deque
+from typing import (Any, Awaitable, Callable, Deque, Dict, Hashable, List,
+                    Optional, Set, TypeVar)
+
+from .event import Event
+
+__all__ = [
+    'EventDispatcher',
+    'KeyedSerializer',
+    'conversation_key',
+]
+
+_T = TypeVar('_T')
+
+_Handler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+_OVERFLOW_POLICIES = ('drop_oldest', 'drop_meta', 'block')
+
+
+class EventDispatcher:
+    """
+    事件调度器，负责运行收到的事件的处理协程。
+
+    不传入 ``workers`` 时，每收到一个事件就立即创建一个 task 来处理它；否则使用固定数量的
+    worker 从有界队列中依次取出事件处理。队列按 ``post_type`` 分为多个优先级通道（见
+    ``priorities`` 参数，数值越小越优先），默认消息事件最优先、元事件最后。
+
+    队列已满时，按 ``overflow`` 参数处理新事件：
+
+    - ``drop_oldest``: 丢弃优先级最低的通道中最早的事件；若新事件的优先级更低，则丢弃新事件
+    - ``drop_meta``: 丢弃元事件，没有元事件可丢弃时，与 ``block`` 相同
+    - ``block``: 等待队列出现空位，即暂停读取事件来源（如 WebSocket 连接）。注意，在
+      Universal 反向 WebSocket 连接上，API 调用结果与事件来自同一连接，暂停读取可能使正在等待
+      API 结果的处理函数一直等到超时
+    """
+
+    default_priorities = {
+        'message': 0,
+        'request': 1,
+        'notice': 1,
+        'meta_event': 2,
+    }
+
+    def __init__(self,
+                 handler: _Handler,
+                 *,
+                 workers: Optional[int] = None,
+                 queue_size: int = 1000,
+                 overflow: str = 'drop_oldest',
+                 priorities: Optional[Dict[str, int]] = None,
+                 logger: Optional[logging.Logger] = None):
+        if overflow not in _OVERFLOW_POLICIES:
+            raise ValueError(f'unknown overflow policy "{overflow}"')
+
+        self._handler = handler
+        self._workers = workers
+        self._queue_size = queue_size
+        self._overflow = overflow
+        self._priorities = priorities or self.default_priorities
+        self._logger = logger or logging.getLogger(__name__)
+
+        self._lanes: List[Deque[Any]] = [
+            deque() for _ in range(max(self._priorities.values()) + 1)
+        ]
+        self._size = 0
+        self._items: Optional[asyncio.Semaphore] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._tasks: Set[asyncio.Task] = set()  # keep references of tasks
+        self.dropped = 0
+        """因队列已满而丢弃的事件数。"""
+
+    def __len__(self) -> int:
+        """队列中等待处理的事件数。"""
+        return self._size
+
+    def _lane_of(self, payload: Dict[str, Any]) -> int:
+        return self._priorities.get(payload.get('post_type'), 1)
+
+    def _start(self) -> None:
+        self._items = asyncio.Semaphore(0)
+        if self._overflow != 'drop_oldest':
+            self._slots = asyncio.Semaphore(self._queue_size)
+        self._worker_tasks = [
+            asyncio.ensure_future(self._work()) for _ in range(self._workers)
+        ]
+
+    async def close(self) -> None:
+        """停止所有 worker，丢弃队列中尚未处理的事件。"""
+        workers, self._worker_tasks = self._worker_tasks, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for lane in self._lanes:
+            lane.clear()
+        self._size = 0
+        self._items = self._slots = None
+
+    async def submit(self, payload: Dict[str, Any]) -> None:
+        """提交一个事件。在 ``block`` 模式下，队列已满时将等待至出现空位。"""
+        ctx = contextvars.copy_context()
+        if not self._workers:
+            self._run(ctx, payload)
+            return
+
+        if not self._worker_tasks:
+            self._start()
+
+        lane = self._lane_of(payload)
+        if self._size >= self._queue_size and self._overflow != 'block':
+            victim = self._victim_lane(lane)
+            if victim is None:
+                self.dropped += 1
+                return
+            if victim >= 0:
+                # the new event takes over the slot of the dropped one
+                self._lanes[victim].popleft()
+                self._lanes[lane].append((ctx, payload))
+                self.dropped += 1
+                return
+
+        if self._slots is not None:
+            await self._slots.acquire()
+        self._lanes[lane].append((ctx, payload))
+        self._size += 1
+        self._items.release()
+
+    def _victim_lane(self, lane: int) -> Optional[int]:
+        """
+        队列已满时，选择要丢弃最早事件的通道；返回 `None` 表示丢弃新事件，返回 -1
+        表示没有可丢弃的事件。
+        """
+        if self._overflow == 'drop_meta':
+            meta_lane = self._priorities.get('meta_event')
+            if lane == meta_lane:
+                return None
+            if meta_lane is None or not self._lanes[meta_lane]:
+                return -1
+            return meta_lane
+
+        victim = max(i for i, q in enumerate(self._lanes) if q)
+        return None if lane > victim else victim
+
+    async def _work(self) -> None:
+        while True:
+            await self._items.acquire()
+            ctx, payload = next(q for q in self._lanes if q).popleft()
+            self._size -= 1
+            if self._slots is not None:
+                self._slots.release()
+            task = self._run(ctx, payload)
+            # exceptions are logged in the done callback
+            await asyncio.wait((task,))
+
+    def _run(self, ctx: contextvars.Context,
+             payload: Dict[str, Any]) -> asyncio.Task:
+        # run in the context where the event was received, so that things
+        # like the current websocket connection are still available
+        task = ctx.run(asyncio.ensure_future, self._handler(payload))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+        return task
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self._logger.error('failed to handle event',
+                               exc_info=task.exception())
+
+
+class KeyedSerializer:
+    """
+    按键串行运行协程：键相同的协程按调用 `run` 的顺序依次运行，键不同的协程并行运行。
+
+    每个键只在有协程正在运行或等待时占用内存，空闲后立即回收。
+    """
+
+    def __init__(self):
+        self._waiters: Dict[Hashable, Deque[asyncio.Future]] = {}
+
+    def __len__(self) -> int:
+        """正在使用的键的个数。"""
+        return len(self._waiters)
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[_T]]) -> _T:
+        """等到键 ``key`` 之前的协程全部运行完毕后，调用 ``func`` 并等待其返回的协程。"""
+        waiters = self._waiters.get(key)
+        if waiters is None:
+            self._waiters[key] = deque()
+        else:
+            turn = asyncio.get_running_loop().create_future()
+            waiters.append(turn)
+            try:
+                await turn
+            except asyncio.CancelledError:
+                if turn.done() and not turn.cancelled():
+                    # it has been our turn, pass it on
+                    self._release(key)
+                else:
+                    waiters.remove(turn)
+                raise
+
+        try:
+            return await func()
+        finally:
+            self._release(key)
+
+    def _release(self, key: Hashable) -> None:
+        waiters = self._waiters[key]
+        while waiters:
+            turn = waiters.popleft()
+            if not turn.done():
+                turn.set_result(None)
+                return
+        del self._waiters[key]
+
+
+def conversation_key(event: Event) -> Optional[Hashable]:
+    """
+    返回事件所属会话的键，可作为 `CQHttp` 的 ``event_order_key`` 参数。
+
+    群、讨论组中的事件以群号、讨论组号区分，其它带有 ``user_id`` 的事件以用户区分，
+    不同机器人账号互不影响；没有上述字段的事件（如元事件）返回 `None`，不需要保证顺序。
+    """
+    if event.group_id is not None:
+        return event.self_id, 'group', event.group_id
+    if event.discuss_id is not None:
+        return event.self_id, 'discuss', event.discuss_id
+    if event.user_id is not None:
+        return event.self_id, 'private', event.user_id
+    return None
@@ -2,8 +2,12 @@
 此模块提供了 OneBot (CQHTTP) 事件相关的类。
 """
 
+import threading
 from typing import Dict, Any, Optional
 
+# sync handlers may read event.message from executor threads concurrently
+_convert_lock = threading.Lock()
+
 
 class Event(dict):
     """
@@ -13,17 +17,42 @@ class Event(dict):
     `None`）依事件不同而不同。
     """
 
+    # message class to convert the "message" field with on first access
+    _message_class: Optional[type] = None
+
     @staticmethod
-    def from_payload(payload: Dict[str, Any]) -> 'Optional[Event]':
+    def from_payload(payload: Dict[str, Any],
+                     message_class: Optional[type] = None) -> 'Optional[Event]':
         """
         从 OneBot 事件数据构造 `Event` 对象。
+
+        传入 ``message_class`` 参数时，``message`` 字段将在第一次通过 ``event.message``、
+        ``event['message']`` 或 ``event.get('message')`` 访问时转换为该类的对象，之后不再重复转换；
+        在此之前，``items()`` 等其它方式得到的仍是转换前的值。转换前的值可通过 `original_message`
+        获取。
         """
         try:
             e = Event(payload)
             _ = e.type, e.detail_type
-            return e
         except KeyError:
             return None
+        if message_class is not None and 'message' in e:
+            object.__setattr__(e, '_original_message',
+                               dict.__getitem__(e, 'message'))
+            object.__setattr__(e, '_message_class', message_class)
+        return e
+
+    def _convert_message(self) -> None:
+        with _convert_lock:
+            message_class = self._message_class
+            if message_class is None:
+                return  # converted by another thread meanwhile
+            if dict.__contains__(self, 'message'):
+                dict.__setitem__(
+                    self, 'message',
+                    message_class(dict.__getitem__(self, 'message')))
+            # clear only after storing, readers skip converting once it's None
+            object.__setattr__(self, '_message_class', None)
 
     @property
     def type(self) -> str:
@@ -48,6 +77,13 @@ class Event(dict):
         """
         return self.get('sub_type')
 
+    @property
+    def original_message(self) -> Optional[Any]:
+        """
+        从 OneBot 收到的、未经 `CQHttp` 的 ``message_class`` 参数转换的 ``message`` 字段。
+        """
+        return self.__dict__.get('_original_message', dict.get(self, 'message'))
+
     @property
     def name(self):
         """
@@ -73,9 +109,38 @@ class Event(dict):
     comment: Optional[str]  # 请求验证消息
     flag: Optional[str]  # 请求标识
 
+    def __getitem__(self, key) -> Any:
+        if key == 'message' and self._message_class is not None:
+            self._convert_message()
+        return super().__getitem__(key)
+
+    def get(self, key, default=None) -> Optional[Any]:
+        if key == 'message' and self._message_class is not None:
+            self._convert_message()
+        return super().get(key, default)
+
+    def __setitem__(self, key, value) -> None:
+        if key == 'message' and self._message_class is not None:
+            with _convert_lock:
+                # the new value replaces the pending one, don't convert it
+                object.__setattr__(self, '_message_class', None)
+                super().__setitem__(key, value)
+            return
+        super().__setitem__(key, value)
+
     def __getattr__(self, key) -> Optional[Any]:
         return self.get(key)
 
+    def __reduce__(self):
+        # convert first, so that copies and unpickled events need no class
+        if self._message_class is not None:
+            self._convert_message()
+        return Event, (dict(self),), dict(self.__dict__)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # explicit, or __getattr__ would answer the lookup with None
+        self.__dict__.update(state)
+
     def __setattr__(self, key, value) -> None:
         self[key] = value
 
@@ -6,6 +6,7 @@ __all__ = [
     'Error',
     'ApiNotAvailable',
     'ApiError',
+    'ApiOverloaded',
     'HttpFailed',
     'ActionFailed',
     'NetworkError',
@@ -28,6 +29,11 @@ class ApiError(Error, RuntimeError):
     pass
 
 
+class ApiOverloaded(ApiError):
+    """同时进行的 OneBot API 调用过多且等待队列已满，调用没有发出。"""
+    pass
+
+
 class HttpFailed(ApiError):
     """HTTP 请求响应码不是 2xx。"""
 
@@ -0,0 +1,97 @@
+"""
+此模块提供了 OneBot API 调用延迟统计相关类。
+"""
+
+import math
+from typing import Dict, Hashable, Optional
+
+__all__ = [
+    'LatencySketch',
+    'LatencyTracker',
+]
+
+
+class LatencySketch:
+    """
+    延迟分布的流式分位数估计。
+
+    样本按对数分桶计数，估计的分位数的相对误差不超过 ``relative_accuracy``，内存占用只与延迟的数量级范围有关。
+    样本总数超过 ``window`` 时，所有计数减半，使估计逐渐偏向最近的样本，以便跟上延迟的变化。
+    """
+
+    __slots__ = ('_gamma_log', '_gamma', '_window', '_buckets', '_count',
+                 '_cache')
+
+    def __init__(self, relative_accuracy: float = 0.02, window: int = 1000):
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._gamma_log = math.log(self._gamma)
+        self._window = window
+        self._buckets: Dict[int, float] = {}
+        self._count = 0.0
+        self._cache: Dict[float, float] = {}
+
+    @property
+    def count(self) -> float:
+        """当前计入的样本数（减半后可能不是整数）。"""
+        return self._count
+
+    def add(self, value: float) -> None:
+        """记录一个样本，单位为秒。"""
+        index = math.ceil(math.log(max(value, 1e-6)) / self._gamma_log)
+        self._buckets[index] = self._buckets.get(index, 0.0) + 1
+        self._count += 1
+        if self._count > self._window:
+            for i in list(self._buckets):
+                count = self._buckets[i] / 2
+                if count < 0.5:
+                    del self._buckets[i]
+                else:
+                    self._buckets[i] = count
+            self._count = sum(self._buckets.values())
+        self._cache.clear()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """估计 ``q``（0 到 1 之间）分位数，没有样本时返回 `None`。"""
+        if not self._buckets:
+            return None
+        value = self._cache.get(q)
+        if value is None:
+            rank = q * self._count
+            seen = 0.0
+            for index in sorted(self._buckets):
+                seen += self._buckets[index]
+                if seen >= rank:
+                    break
+            # midpoint of the bucket (gamma^(i-1), gamma^i]
+            value = 2 * self._gamma**index / (self._gamma + 1)
+            self._cache[q] = value
+        return value
+
+
+class LatencyTracker:
+    """
+    按键（例如 API 动作名）分别统计延迟，每个键使用一个 `LatencySketch`。
+    """
+
+    def __init__(self, min_samples: int = 20, **sketch_kwargs):
+        """
+        ``min_samples`` 参数为估计分位数所需的最少样本数，``sketch_kwargs`` 将传给
+        `LatencySketch`。
+        """
+        self._min_samples = min_samples
+        self._sketch_kwargs = sketch_kwargs
+        self._sketches: Dict[Hashable, LatencySketch] = {}
+
+    def observe(self, key: Hashable, seconds: float) -> None:
+        """记录键 ``key`` 的一次延迟。"""
+        sketch = self._sketches.get(key)
+        if sketch is None:
+            sketch = self._sketches[key] = LatencySketch(**self._sketch_kwargs)
+        sketch.add(seconds)
+
+    def quantile(self, key: Hashable, q: float) -> Optional[float]:
+        """估计键 ``key`` 的延迟的 ``q`` 分位数，样本不足时返回 `None`。"""
+        sketch = self._sketches.get(key)
+        if sketch is None or sketch.count < self._min_samples:
+            return None
+        return sketch.quantile(q)
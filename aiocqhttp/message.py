@@ -4,20 +4,33 @@
 
 import sys
 import re
-from typing import Iterable, Dict, Tuple, Any, Optional, Union
+from typing import Iterable, Dict, Any, Hashable, Optional, Union
 
+from .codec import JsonCodec, RawJson
 from .typing import Message_T
 
 
 __pdoc__ = {}
 
 
+_CQ_CODE = re.compile(r'\[CQ:(?P<type>[a-zA-Z0-9-_.]+)'
+                      r'(?P<params>'
+                      r'(?:,[a-zA-Z0-9-_.]+=[^,\]]*)*'
+                      r'),?\]')
+
+_ESCAPE_CHARS = re.compile(r'[&\[\],]')
+
+
 def escape(s: str, *, escape_comma: bool = True) -> str:
     """
     对字符串进行 CQ 码转义。
 
     ``escape_comma`` 参数控制是否转义逗号（``,``）。
     """
+    if _ESCAPE_CHARS.search(s) is None:
+        return s
+    # str.replace is a single C-level scan and returns the string itself
+    # when nothing matches, which beats a regex or translate() callback
     s = s.replace('&', '&amp;') \
         .replace('[', '&#91;') \
         .replace(']', '&#93;')
@@ -28,12 +41,19 @@ def escape(s: str, *, escape_comma: bool = True) -> str:
 
 def unescape(s: str) -> str:
     """对字符串进行 CQ 码去转义。"""
+    if '&' not in s:
+        return s
     return s.replace('&#44;', ',') \
         .replace('&#91;', '[') \
         .replace('&#93;', ']') \
         .replace('&amp;', '&')
 
 
+def _intern(s: Any) -> Any:
+    # segment types and data keys come from a small set, share the strings
+    return sys.intern(s) if type(s) is str else s
+
+
 def _optionally_strfy(x: Optional[Any]) -> Optional[str]:
     if x is not None:
         if isinstance(x, bool):
@@ -68,6 +88,9 @@ class MessageSegment(dict):
     ```
     """
 
+    # no per-instance __dict__, segments are usually kept in large numbers
+    __slots__ = ()
+
     def __init__(self,
                  d: Optional[Dict[str, Any]] = None,
                  *,
@@ -80,12 +103,11 @@ class MessageSegment(dict):
 
         当没有正确传入类型参数时，抛出 ``ValueError``。
         """
-        super().__init__()
         if isinstance(d, dict) and d.get('type'):
-            self.update(d)
+            super().__init__(d)
+            dict.__setitem__(self, 'type', _intern(d['type']))
         elif type_:
-            self.type = type_
-            self.data = data
+            super().__init__(type=_intern(type_), data=data or {})
         else:
             raise ValueError('the "type" field cannot be None or empty')
 
@@ -109,11 +131,11 @@ class MessageSegment(dict):
 
         纯文本消息段的类型名为 ``text``。
         """
-        return self['type']
+        return dict.__getitem__(self, 'type')
 
     @type.setter
     def type(self, type_: str):
-        self['type'] = type_
+        dict.__setitem__(self, 'type', _intern(type_))
 
     @property
     def data(self) -> Dict[str, str]:
@@ -122,22 +144,20 @@ class MessageSegment(dict):
 
         该字典内所有值都是未经 CQ 码转义的字符串。
         """
-        return self['data']
+        return dict.__getitem__(self, 'data')
 
     @data.setter
     def data(self, data: Optional[Dict[str, str]]):
-        self['data'] = data or {}
+        dict.__setitem__(self, 'data', data or {})
 
     def __str__(self):
         """将消息段转换成字符串格式。"""
-        if self.type == 'text':
-            return escape(self.data.get('text', ''), escape_comma=False)
+        type_, data = self.type, self.data
+        if type_ == 'text':
+            return escape(data.get('text', ''), escape_comma=False)
 
-        params = ','.join(
-            ('{}={}'.format(k, escape(str(v))) for k, v in self.data.items()))
-        if params:
-            params = ',' + params
-        return '[CQ:{type}{params}]'.format(type=self.type, params=params)
+        params = ''.join([f',{k}={escape(str(v))}' for k, v in data.items()])
+        return f'[CQ:{type_}{params}]'
 
     __pdoc__['MessageSegment.__str__'] = True
 
@@ -402,12 +422,14 @@ class Message(list):
 
     def __init__(self, msg: Any = None, *args, **kwargs):
         """
-        - ``msg``: 要转换为 `Message` 对象的字符串、列表或字典。不传入则构造空消息。
+        - ``msg``: 要转换为 `Message` 对象的字符串、列表、字典或 `FrozenMessage`。不传入则构造空消息。
 
         当 ``msg`` 不能识别时，抛出 ``ValueError``。
         """
         super().__init__(*args, **kwargs)
-        if isinstance(msg, (list, str)):
+        if isinstance(msg, FrozenMessage):
+            self.extend(msg.segments())
+        elif isinstance(msg, (list, str)):
             self.extend(msg)
         elif isinstance(msg, dict):
             self.append(msg)
@@ -416,40 +438,32 @@ class Message(list):
 
     @staticmethod
     def _split_iter(msg_str: str) -> Iterable[MessageSegment]:
-
-        def iter_function_name_and_extra() -> Iterable[Tuple[str, str]]:
-            text_begin = 0
-            for cqcode in re.finditer(
-                    r'\[CQ:(?P<type>[a-zA-Z0-9-_.]+)'
-                    r'(?P<params>'
-                    r'(?:,[a-zA-Z0-9-_.]+=[^,\]]*)*'
-                    r'),?\]',
-                    msg_str,
-            ):
-                yield 'text', msg_str[text_begin:cqcode.pos + cqcode.start()]
-                text_begin = cqcode.pos + cqcode.end()
-                yield cqcode.group('type'), cqcode.group('params').lstrip(',')
-            yield 'text', msg_str[text_begin:]
-
-        for function_name, extra in iter_function_name_and_extra():
-            if function_name == 'text':
-                if extra:
+        text_begin = 0
+        if '[CQ:' in msg_str:
+            for cqcode in _CQ_CODE.finditer(msg_str):
+                text = msg_str[text_begin:cqcode.start()]
+                if text:
                     # only yield non-empty text segment
-                    yield MessageSegment(type_=function_name,
-                                         data={'text': unescape(extra)})
-            else:
-                data = {
-                    k: unescape(v) for k, v in map(
-                        lambda x: x.split('=', maxsplit=1),
-                        filter(lambda x: x, (
-                            x.lstrip() for x in extra.split(','))),
-                    )
-                }
-                yield MessageSegment(type_=function_name, data=data)
+                    yield MessageSegment(type_='text',
+                                         data={'text': unescape(text)})
+                text_begin = cqcode.end()
+
+                type_, params = cqcode.group('type', 'params')
+                data = {}
+                # params is either empty or ",k1=v1,k2=v2", and neither the
+                # keys nor the values can contain commas
+                for param in params.split(',')[1:]:
+                    k, _, v = param.partition('=')
+                    data[_intern(k)] = unescape(v)
+                yield MessageSegment(type_=type_, data=data)
+
+        text = msg_str[text_begin:]
+        if text:
+            yield MessageSegment(type_='text', data={'text': unescape(text)})
 
     def __str__(self):
         """将消息转换成字符串格式。"""
-        return ''.join((str(seg) for seg in self))
+        return ''.join([str(seg) for seg in self])
 
     __pdoc__['Message.__str__'] = True
 
@@ -469,6 +483,8 @@ class Message(list):
             self.append(MessageSegment(other))
         elif isinstance(other, str):
             self.extend(Message._split_iter(other))
+        elif isinstance(other, FrozenMessage):
+            self.extend(other.segments())
         else:
             raise ValueError('the addend is not a message')
         return self
@@ -480,8 +496,12 @@ class Message(list):
         将两个消息对象拼接。
 
         当 ``other`` 不是合法的消息（段）时，抛出 ``ValueError``。
+
+        此操作会复制整个消息，逐段构造长消息时请使用 `MessageBuilder`。
         """
-        result = Message(self)
+        result = Message()
+        # self is already a valid message, a plain copy is enough
+        list.extend(result, self)
         result.__iadd__(other)
         return result
 
@@ -535,16 +555,23 @@ class Message(list):
         """
         化简消息，即去除多余消息段、合并相邻纯文本消息段。
 
-        由于 `Message` 类基于 `list`，此方法时间复杂度为 O(n)。
+        此方法时间复杂度为 O(n)。
         """
-        idx = 0
-        while idx < len(self):
-            if idx > 0 and \
-                    self[idx - 1].type == 'text' and self[idx].type == 'text':
-                self[idx - 1].data['text'] += self[idx].data['text']
-                del self[idx]
+        segments = []
+        texts = []  # texts of the run of text segments ending at segments[-1]
+        for seg in self:
+            if seg.type == 'text':
+                texts.append(seg.data['text'])
+                if len(texts) > 1:
+                    continue
             else:
-                idx += 1
+                if len(texts) > 1:
+                    segments[-1].data['text'] = ''.join(texts)
+                texts.clear()
+            segments.append(seg)
+        if len(texts) > 1:
+            segments[-1].data['text'] = ''.join(texts)
+        self[:] = segments
 
     def extract_plain_text(self, reduce: bool = False) -> str:
         """
@@ -555,10 +582,218 @@ class Message(list):
         if reduce:
             self.reduce()
 
-        result = ''
-        for seg in self:
+        return ' '.join(
+            [seg.data['text'] for seg in self if seg.type == 'text'])
+
+
+class MessageBuilder:
+    """
+    消息构造器，用于逐段构造长消息。
+
+    与对 `Message` 反复使用 ``+`` 不同，追加消息段不会复制已有内容，相邻的纯文本在 `build`
+    时一次性合并，因此构造 n 个消息段的消息的总时间复杂度为 O(n)，例如：
+
+    ```py
+    builder = MessageBuilder()
+    for user_id, score in ranking:
+        builder.append(MessageSegment.at(user_id)).text(f' {score} 分\n')
+    await bot.send(event, builder.build())
+    ```
+    """
+
+    def __init__(self):
+        self._segments = []
+
+    def __len__(self) -> int:
+        """已追加的消息段个数（尚未合并相邻的纯文本）。"""
+        return len(self._segments)
+
+    def append(self, msg: Message_T) -> 'MessageBuilder':
+        """
+        追加消息（段），字符串将作为 CQ 码解析，返回构造器本身以便链式调用。
+
+        当 ``msg`` 不是合法的消息（段）时，抛出 ``ValueError``。
+        """
+        if isinstance(msg, MessageSegment):
+            self._segments.append(msg)
+        elif isinstance(msg, str):
+            self._segments.extend(Message._split_iter(msg))
+        elif isinstance(msg, dict):
+            self._segments.append(MessageSegment(msg))
+        elif isinstance(msg, FrozenMessage):
+            self._segments.extend(msg.segments())
+        elif isinstance(msg, list):
+            self._segments.extend(
+                seg if isinstance(seg, MessageSegment) else MessageSegment(seg)
+                for seg in msg)
+        else:
+            raise ValueError('the addend is not a message')
+        return self
+
+    def text(self, text: str) -> 'MessageBuilder':
+        """追加纯文本（不解析 CQ 码），返回构造器本身以便链式调用。"""
+        if text:
+            self._segments.append(MessageSegment.text(text))
+        return self
+
+    def __iadd__(self, msg: Message_T) -> 'MessageBuilder':
+        """同 `MessageBuilder.append`。"""
+        return self.append(msg)
+
+    __pdoc__['MessageBuilder.__iadd__'] = True
+
+    def build(self) -> Message:
+        """
+        构造 `Message` 对象，相邻的纯文本消息段合并为新的消息段，空的纯文本消息段被忽略。构造器可继续使用。
+        """
+        msg = Message()
+        texts = []
+        for seg in self._segments:
             if seg.type == 'text':
-                result += ' ' + seg.data['text']
-        if result:
-            result = result[1:]
-        return result
+                texts.append(seg.data['text'])
+                continue
+            if texts:
+                self._flush_text(msg, texts)
+            list.append(msg, seg)
+        if texts:
+            self._flush_text(msg, texts)
+        return msg
+
+    @staticmethod
+    def _flush_text(msg: Message, texts: list) -> None:
+        text = ''.join(texts)
+        texts.clear()
+        if text:
+            list.append(msg, MessageSegment.text(text))
+
+
+# used to build the cached wire form, any backend gives valid JSON
+_codec = JsonCodec()
+
+
+def _copy_nested(value: Any) -> Any:
+    # nested lists and dicts (e.g. custom forward node content) are copied
+    if isinstance(value, list):
+        return [_copy_nested(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _copy_nested(v) for k, v in value.items()}
+    return value
+
+
+def _freeze_nested(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_nested(v) for v in value)
+    if isinstance(value, dict):
+        # like dict equality, the order of keys doesn't matter
+        return frozenset((k, _freeze_nested(v)) for k, v in value.items())
+    return value
+
+
+class FrozenMessage(RawJson):
+    """
+    不可变的消息，构造时即计算并缓存其哈希值和 JSON 数组形式，CQ 码字符串形式在第一次使用时缓存。
+
+    适合反复发送的固定回复、模板等：作为 API 参数时直接使用缓存的 JSON 数组形式（见
+    `codec.RawJson`），`CQHttp.send` 在没有 `CQHttp.before_sending` 钩子且不需要 at
+    发送者时也会原样发送。可以作为字典的键或放入集合，例如：
+
+    ```py
+    HELP = FrozenMessage('帮助信息' + MessageSegment.face(14))
+
+    @bot.on_message
+    async def handler(event):
+        await bot.send(event, HELP)
+    ```
+
+    需要修改时，可用 `to_message` 转换为 `Message`；`Message` 也可与此类对象拼接。
+    """
+
+    __slots__ = ('_segments', '_hash', '_str')
+
+    def __init__(self, msg: Message_T = None):
+        """
+        - ``msg``: 要转换为 `FrozenMessage` 对象的消息，可以是 `Message` 构造函数能接受的任何值。
+
+        当 ``msg`` 不能识别，或消息段数据中含有列表、字典以外的不可哈希的值时，抛出 ``ValueError``。
+        """
+        if isinstance(msg, FrozenMessage):
+            segments = msg._segments
+        else:
+            if not isinstance(msg, Message):
+                msg = Message(msg)
+            segments = tuple((seg.type,
+                              tuple((k, _copy_nested(v))
+                                    for k, v in seg.data.items()))
+                             for seg in msg)
+        try:
+            # segments compare like dicts, where the order of keys doesn't
+            # matter
+            hash_ = hash(
+                tuple((type_, _freeze_nested(dict(data)))
+                      for type_, data in segments))
+        except TypeError as e:
+            raise ValueError(f'unhashable message segment data: {e}')
+        super().__init__(_codec.dumps_bytes([{
+            'type': type_,
+            'data': dict(data),
+        } for type_, data in segments]))
+        self._segments = segments
+        self._hash = hash_
+        self._str: Optional[str] = None
+
+    def segments(self) -> Iterable[MessageSegment]:
+        """依次生成各消息段的副本。"""
+        for type_, data in self._segments:
+            yield MessageSegment(type_=type_,
+                                 data={k: _copy_nested(v) for k, v in data})
+
+    def to_message(self) -> Message:
+        """转换为可修改的 `Message` 对象。"""
+        return Message(self)
+
+    def extract_plain_text(self) -> str:
+        """提取消息中的所有纯文本消息段，合并，中间用空格分隔。"""
+        return ' '.join(
+            dict(data)['text'] for type_, data in self._segments
+            if type_ == 'text')
+
+    def __str__(self) -> str:
+        """将消息转换成字符串格式。"""
+        if self._str is None:
+            self._str = str(self.to_message())
+        return self._str
+
+    __pdoc__['FrozenMessage.__str__'] = True
+
+    def __len__(self) -> int:
+        """消息段个数。"""
+        return len(self._segments)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        """判断两个消息是否相同。"""
+        if not isinstance(other, FrozenMessage):
+            return NotImplemented
+        return self._hash == other._hash and \
+            len(self._segments) == len(other._segments) and \
+            all(t1 == t2 and dict(d1) == dict(d2) for (t1, d1), (
+                t2, d2) in zip(self._segments, other._segments))
+
+    __pdoc__['FrozenMessage.__eq__'] = True
+
+    def __add__(self, other: Any) -> Message:
+        """与其它消息拼接，得到新的 `Message` 对象。"""
+        return self.to_message().__iadd__(other)
+
+    __pdoc__['FrozenMessage.__add__'] = True
+
+    def __radd__(self, other: Any) -> Message:
+        """与其它消息拼接，得到新的 `Message` 对象。"""
+        return Message(other).__iadd__(self)
+
+    __pdoc__['FrozenMessage.__radd__'] = True
+
+    def __repr__(self) -> str:
+        return f'<FrozenMessage {str(self)!r}>'
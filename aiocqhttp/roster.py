@@ -0,0 +1,211 @@
+"""
+此模块提供了群列表和群成员列表的本地索引。
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from .api import AsyncApi
+from .event import Event
+from .exceptions import ApiNotAvailable, NetworkError
+
+__all__ = [
+    'GroupRoster',
+]
+
+_ROLES = ('member', 'admin', 'owner')
+_ROLE_CODES = {role: code for code, role in enumerate(_ROLES)}
+
+# retry delays of loading on connect double from the min up to the max
+_MIN_RETRY_SEC = 1.0
+_MAX_RETRY_SEC = 32.0
+
+
+class GroupRoster:
+    """
+    群列表和群成员列表的本地索引，按机器人账号分别保存，查询时不需要调用 API。
+
+    调用 `handle_event` 后，收到 ``meta_event.lifecycle.connect`` 事件时会在后台通过
+    ``get_group_list`` 和 ``get_group_member_list`` 加载对应账号的全部数据（API
+    暂不可用时，例如 API 连接晚于事件连接建立，以指数退避的间隔重试），之后根据群成员增减、
+    群管理员变动通知增量更新。也可以调用 `load` 手动加载（例如使用 HTTP 上报时）。
+
+    为节省内存，每个群只保存群名和成员上限，每个成员只保存其角色。
+    """
+
+    def __init__(self,
+                 api: AsyncApi,
+                 *,
+                 concurrency: int = 8,
+                 logger: Optional[logging.Logger] = None):
+        """
+        ``api`` 参数为用于加载数据的 API 对象，``concurrency``
+        参数为加载时同时获取成员列表的群数。
+        """
+        self._api = api
+        self._concurrency = concurrency
+        self._logger = logger or logging.getLogger(__name__)
+        # self_id -> group_id -> (group_name, max_member_count)
+        self._groups: Dict[int, Dict[int, Tuple[str, int]]] = {}
+        # (self_id, group_id) -> user_id -> role code
+        self._members: Dict[Tuple[int, int], Dict[int, int]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._loading: Dict[int, asyncio.Task] = {}  # self_id -> load task
+
+    def group_ids(self, self_id: int) -> Iterable[int]:
+        """机器人所在的群的群号。"""
+        return self._groups.get(self_id, {}).keys()
+
+    def has_group(self, self_id: int, group_id: int) -> bool:
+        """机器人是否在群中。"""
+        return group_id in self._groups.get(self_id, ())
+
+    def group_name(self, self_id: int, group_id: int) -> Optional[str]:
+        """群名，不在群中时返回 `None`。"""
+        info = self._groups.get(self_id, {}).get(group_id)
+        return info[0] if info else None
+
+    def member_count(self, self_id: int, group_id: int) -> Optional[int]:
+        """群成员数，成员列表未加载时返回 `None`。"""
+        members = self._members.get((self_id, group_id))
+        return len(members) if members is not None else None
+
+    def max_member_count(self, self_id: int, group_id: int) -> Optional[int]:
+        """群成员上限，不在群中时返回 `None`。"""
+        info = self._groups.get(self_id, {}).get(group_id)
+        return info[1] if info else None
+
+    def role(self, self_id: int, group_id: int,
+             user_id: int) -> Optional[str]:
+        """
+        群成员的角色，为 ``owner``、``admin``、``member`` 之一，不是群成员或成员列表未加载时返回
+        `None`。
+        """
+        code = self._members.get((self_id, group_id), {}).get(user_id)
+        return _ROLES[code] if code is not None else None
+
+    def is_member(self, self_id: int, group_id: int, user_id: int) -> bool:
+        """用户是否为群成员。"""
+        return user_id in self._members.get((self_id, group_id), ())
+
+    def is_admin(self, self_id: int, group_id: int, user_id: int) -> bool:
+        """用户是否为群管理员或群主。"""
+        code = self._members.get((self_id, group_id), {}).get(user_id, 0)
+        return code >= _ROLE_CODES['admin']
+
+    def is_owner(self, self_id: int, group_id: int, user_id: int) -> bool:
+        """用户是否为群主。"""
+        code = self._members.get((self_id, group_id), {}).get(user_id, 0)
+        return code == _ROLE_CODES['owner']
+
+    async def load(self, self_id: int) -> None:
+        """加载机器人账号 ``self_id`` 的群列表和所有群的成员列表。"""
+        groups = await self._api.call_action('get_group_list',
+                                             self_id=self_id)
+        self._groups[self_id] = {
+            g['group_id']: self._group_info(g) for g in groups
+        }
+        for key in [k for k in self._members if k[0] == self_id]:
+            if key[1] not in self._groups[self_id]:
+                del self._members[key]
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def load_members(group_id: int) -> None:
+            async with semaphore:
+                await self._load_members(self_id, group_id)
+
+        await asyncio.gather(*map(load_members, self._groups[self_id]))
+
+    async def load_group(self, self_id: int, group_id: int) -> None:
+        """加载单个群的信息和成员列表。"""
+        group = await self._api.call_action('get_group_info',
+                                            self_id=self_id,
+                                            group_id=group_id)
+        self._groups.setdefault(self_id, {})[group_id] = \
+            self._group_info(group)
+        await self._load_members(self_id, group_id)
+
+    async def _load_members(self, self_id: int, group_id: int) -> None:
+        members = await self._api.call_action('get_group_member_list',
+                                              self_id=self_id,
+                                              group_id=group_id)
+        if group_id in self._groups.get(self_id, ()):
+            self._members[(self_id, group_id)] = {
+                m['user_id']: _ROLE_CODES.get(m.get('role'), 0)
+                for m in members
+            }
+
+    @staticmethod
+    def _group_info(group: Dict[str, Any]) -> Tuple[str, int]:
+        return group.get('group_name', ''), group.get('max_member_count', 0)
+
+    def _remove_group(self, self_id: int, group_id: int) -> None:
+        self._groups.get(self_id, {}).pop(group_id, None)
+        self._members.pop((self_id, group_id), None)
+
+    async def _load_retrying(self, self_id: int) -> None:
+        delay = _MIN_RETRY_SEC
+        while True:
+            try:
+                await self.load(self_id)
+                return
+            except (ApiNotAvailable, NetworkError) as e:
+                if delay > _MAX_RETRY_SEC:
+                    raise
+                self._logger.warning(
+                    f'failed to load group roster of {self_id}: {e!r}, '
+                    f'retrying in {delay:g} seconds')
+            await asyncio.sleep(delay)
+            delay *= 2
+
+    def _run_in_background(self, coro) -> asyncio.Task:
+
+        def on_done(task: asyncio.Task) -> None:
+            self._tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                self._logger.warning('failed to load group roster: %r',
+                                     task.exception())
+
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(on_done)
+        return task
+
+    def handle_event(self, event: Event) -> None:
+        """根据事件更新索引。"""
+        if event.name == 'meta_event.lifecycle.connect':
+            self_id = event.self_id
+            previous = self._loading.get(self_id)
+            if previous is not None:
+                previous.cancel()  # a reconnect starts over
+            task = self._run_in_background(self._load_retrying(self_id))
+            self._loading[self_id] = task
+
+            def on_done(t: asyncio.Task) -> None:
+                if self._loading.get(self_id) is t:
+                    del self._loading[self_id]
+
+            task.add_done_callback(on_done)
+            return
+        if event.type != 'notice':
+            return
+
+        self_id, group_id, user_id = \
+            event.self_id, event.group_id, event.user_id
+        members = self._members.get((self_id, group_id))
+        if event.detail_type == 'group_increase':
+            if user_id == self_id:
+                self._run_in_background(self.load_group(self_id, group_id))
+            elif members is not None:
+                members[user_id] = _ROLE_CODES['member']
+        elif event.detail_type == 'group_decrease':
+            if user_id == self_id or event.sub_type == 'kick_me':
+                self._remove_group(self_id, group_id)
+            elif members is not None:
+                members.pop(user_id, None)
+        elif event.detail_type == 'group_admin':
+            if members is not None and user_id in members:
+                members[user_id] = _ROLE_CODES[
+                    'admin' if event.sub_type == 'set' else 'member']
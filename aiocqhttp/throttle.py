@@ -0,0 +1,301 @@
+"""
+此模块提供了 OneBot API 调用限流相关类。
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, List, Optional
+
+from .exceptions import ApiOverloaded
+from .typing import RateLimit_T
+
+__all__ = [
+    'TokenBucket',
+    'SendScheduler',
+    'ConcurrencyLimit',
+    'ConcurrencyLimiter',
+]
+
+# idle buckets are pruned once there are more buckets than this
+_MAX_IDLE_BUCKETS = 4096
+
+
+class TokenBucket:
+    """
+    令牌桶，每秒补充 ``rate`` 个令牌，最多保存 ``capacity`` 个。
+    """
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated', 'urgent')
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+        self.urgent = 0  # number of high priority waiters
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """距离有可用令牌还需等待的秒数，有可用令牌时为 0。"""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        """取走一个令牌。"""
+        self._refill(now)
+        self.tokens -= 1
+
+    def idle(self, now: float) -> bool:
+        """令牌桶是否已满且没有等待者，即可被回收。"""
+        self._refill(now)
+        return self.tokens >= self.capacity and not self.urgent
+
+
+class SendScheduler:
+    """
+    发送消息的限流调度器。
+
+    ``account_rate`` 和 ``group_rate`` 参数分别为每个机器人账号、每个群的发送速率限制，格式为
+    ``(每秒消息数, 突发数)``，不传入则不限制。
+
+    发送分为交互式（默认）和批量（API 调用时传入 ``bulk=True``）两种优先级：当某个账号或群
+    有交互式发送在等待时，该账号或群上的批量发送会让行，使交互式回复不必排在大批量推送之后。
+    """
+
+    actions = frozenset({'send_msg', 'send_group_msg', 'send_private_msg'})
+    """受限流调度的 API 动作名。"""
+
+    def __init__(self,
+                 account_rate: Optional[RateLimit_T] = None,
+                 group_rate: Optional[RateLimit_T] = None):
+        self._account_rate = account_rate
+        self._group_rate = group_rate
+        self._accounts: Dict[Hashable, TokenBucket] = {}
+        self._groups: Dict[Hashable, TokenBucket] = {}
+        self._waiting = {'interactive': 0, 'bulk': 0}
+
+    @property
+    def queue_depth(self) -> Dict[str, int]:
+        """
+        正在等待的交互式和批量发送数，形如 ``{'interactive': 1, 'bulk': 100}``。
+        """
+        return dict(self._waiting)
+
+    @staticmethod
+    def target_group(action: str, params: Dict[str, Any]) -> Optional[Any]:
+        """获取发送消息的目标群号，不是发往群时返回 `None`。"""
+        if action == 'send_group_msg':
+            return params.get('group_id')
+        if action == 'send_msg':
+            message_type = params.get('message_type')
+            if message_type == 'group' or \
+                    message_type is None and 'group_id' in params:
+                return params.get('group_id')
+        return None
+
+    def _bucket(self, buckets: Dict[Hashable, TokenBucket], key: Hashable,
+                rate: Optional[RateLimit_T],
+                now: float) -> Optional[TokenBucket]:
+        if rate is None:
+            return None
+        bucket = buckets.get(key)
+        if bucket is None:
+            if len(buckets) >= _MAX_IDLE_BUCKETS:
+                for k in [k for k, b in buckets.items() if b.idle(now)]:
+                    del buckets[k]
+            bucket = buckets[key] = TokenBucket(*rate, now)
+        return bucket
+
+    async def acquire(self,
+                      self_id: Optional[Any],
+                      group_id: Optional[Any] = None,
+                      bulk: bool = False) -> None:
+        """等待直到可以向群 ``group_id``（不是发往群时为 `None`）发送一条消息。"""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self_id = str(self_id) if self_id is not None else None
+        buckets: List[TokenBucket] = [
+            b for b in (
+                self._bucket(self._accounts, self_id, self._account_rate, now),
+                self._bucket(self._groups, (self_id, str(group_id)),
+                             self._group_rate, now)
+                if group_id is not None else None,
+            ) if b is not None
+        ]
+        if not buckets:
+            return
+
+        lane = 'bulk' if bulk else 'interactive'
+        self._waiting[lane] += 1
+        if not bulk:
+            for b in buckets:
+                b.urgent += 1
+        try:
+            while True:
+                now = loop.time()
+                if bulk and any(b.urgent for b in buckets):
+                    # give way to interactive sends, check again later
+                    delay = max(1 / b.rate for b in buckets if b.urgent)
+                else:
+                    delay = max(b.delay(now) for b in buckets)
+                    if delay <= 0:
+                        for b in buckets:
+                            b.take(now)
+                        return
+                await asyncio.sleep(delay)
+        finally:
+            self._waiting[lane] -= 1
+            if not bulk:
+                for b in buckets:
+                    b.urgent -= 1
+
+
+class ConcurrencyLimit:
+    """
+    单个机器人账号的并发限制状态。
+    """
+
+    __slots__ = ('limit', 'inflight', 'waiters', 'decreased', 'baselines')
+
+    def __init__(self, limit: float, now: float):
+        self.limit = limit
+        self.inflight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.decreased = now  # when the limit was last decreased
+        self.baselines: Dict[str, float] = {}  # action -> latency
+
+    def idle(self) -> bool:
+        """是否没有进行中和等待中的调用，即可被回收。"""
+        return not self.inflight and not self.waiters
+
+
+class ConcurrencyLimiter:
+    """
+    OneBot API 调用的自适应并发限制器，每个机器人账号的并发上限按 AIMD（加性增、乘性减）调整。
+
+    调用的延迟不超过该账号该 API 的基线延迟（最小延迟，负载较低时缓慢跟随实际延迟）的 ``tolerance``
+    倍且并发接近上限时，上限增加 ``1 / 上限``，即每轮增加 1；延迟超出或调用以网络错误失败时，上限乘以
+    ``backoff``，每轮最多减少一次。
+    上限在 ``min_limit`` 和 ``max_limit`` 之间，初始为 ``initial_limit``。
+
+    达到上限后的调用按顺序排队等待，排队数达到 ``max_queue`` 时，新的调用立即以
+    `exceptions.ApiOverloaded` 失败。
+    """
+
+    def __init__(self,
+                 max_limit: int = 64,
+                 *,
+                 initial_limit: int = 4,
+                 min_limit: int = 1,
+                 max_queue: int = 100,
+                 tolerance: float = 2.0,
+                 backoff: float = 0.9):
+        self._max_limit = max_limit
+        self._initial_limit = min(initial_limit, max_limit)
+        self._min_limit = min_limit
+        self._max_queue = max_queue
+        self._tolerance = tolerance
+        self._backoff = backoff
+        self._limits: Dict[Hashable, ConcurrencyLimit] = {}
+
+    def stats(self, self_id: Optional[Any]) -> Dict[str, float]:
+        """
+        机器人账号 ``self_id`` 当前的并发上限、进行中和排队中的调用数，形如
+        ``{'limit': 8.5, 'inflight': 8, 'queued': 3}``。
+        """
+        state = self._limits.get(self._key(self_id))
+        if state is None:
+            return {'limit': self._initial_limit, 'inflight': 0, 'queued': 0}
+        return {
+            'limit': state.limit,
+            'inflight': state.inflight,
+            'queued': len(state.waiters)
+        }
+
+    @staticmethod
+    def _key(self_id: Optional[Any]) -> Optional[str]:
+        return str(self_id) if self_id is not None else None
+
+    def _state(self, key: Optional[str], now: float) -> ConcurrencyLimit:
+        state = self._limits.get(key)
+        if state is None:
+            if len(self._limits) >= _MAX_IDLE_BUCKETS:
+                for k in [k for k, s in self._limits.items() if s.idle()]:
+                    del self._limits[k]
+            state = self._limits[key] = ConcurrencyLimit(
+                self._initial_limit, now)
+        return state
+
+    async def acquire(self, self_id: Optional[Any]) -> float:
+        """
+        等待直到机器人账号 ``self_id`` 可以发起一个 API 调用，返回开始调用的时刻，调用结束后应将其传给
+        `release`。
+        """
+        loop = asyncio.get_running_loop()
+        state = self._state(self._key(self_id), loop.time())
+        if state.inflight >= state.limit or state.waiters:
+            if len(state.waiters) >= self._max_queue:
+                raise ApiOverloaded
+            waiter = loop.create_future()
+            state.waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                if waiter.done() and not waiter.cancelled():
+                    # got a slot but is cancelled, pass it on
+                    state.inflight -= 1
+                    self._wake(state)
+                elif waiter in state.waiters:
+                    state.waiters.remove(waiter)
+                raise
+        else:
+            state.inflight += 1
+        return loop.time()
+
+    def release(self,
+                self_id: Optional[Any],
+                started: float,
+                action: Optional[str] = None,
+                latency_sec: Optional[float] = None,
+                congested: bool = False) -> None:
+        """
+        结束机器人账号 ``self_id`` 上开始于 ``started`` 的 API 调用。
+
+        ``latency_sec`` 为收到响应时调用 ``action`` 的延迟，``congested`` 表示调用以超时等网络错误失败；
+        都没有传入时（例如请求没有发出）只释放并发名额，不调整上限。
+        """
+        state = self._limits[self._key(self_id)]
+        saturated = state.inflight * 2 >= state.limit
+        state.inflight -= 1
+
+        if latency_sec is not None and action is not None:
+            baseline = state.baselines.get(action)
+            if baseline is None or latency_sec < baseline:
+                baseline = latency_sec
+            elif not saturated:
+                # light load, so OneBot itself got slower, drift upwards
+                baseline += (latency_sec - baseline) * 0.01
+            state.baselines[action] = baseline
+            congested = latency_sec > baseline * self._tolerance
+
+        if congested:
+            # calls started before the last decrease saw the old limit
+            if started > state.decreased:
+                state.limit = max(self._min_limit,
+                                  state.limit * self._backoff)
+                state.decreased = asyncio.get_running_loop().time()
+        elif latency_sec is not None and saturated:
+            state.limit = min(self._max_limit, state.limit + 1 / state.limit)
+        self._wake(state)
+
+    @staticmethod
+    def _wake(state: ConcurrencyLimit) -> None:
+        while state.waiters and state.inflight < state.limit:
+            waiter = state.waiters.popleft()
+            if not waiter.done():
+                state.inflight += 1
+                waiter.set_result(None)
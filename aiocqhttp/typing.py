@@ -2,14 +2,20 @@
 此模块提供了用于类型提示的定义。
 """
 
-from typing import TYPE_CHECKING, Union, Dict, Any, List
+from typing import TYPE_CHECKING, Union, Dict, Any, List, Tuple
 
 if TYPE_CHECKING:
-    from .message import Message, MessageSegment
+    from .message import Message, MessageSegment, FrozenMessage
 
 __all__ = [
     'Message_T',
+    'CachePolicy_T',
+    'RateLimit_T',
 ]
 
 Message_T = Union[str, Dict[str, Any], List[Dict[str, Any]], 'MessageSegment',
-                  'Message']
+                  'Message', 'FrozenMessage']
+
+CachePolicy_T = Union[float, Tuple[float, int]]
+
+RateLimit_T = Tuple[float, float]
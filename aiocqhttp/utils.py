@@ -3,21 +3,77 @@
 """
 
 import asyncio
-from typing import (Any, Callable, Awaitable, Iterable, List)
+import contextvars
+import functools
+from concurrent.futures import Executor
+from typing import (Any, Callable, Awaitable, Dict, Hashable, Iterable, List,
+                    Optional)
 
 from quart.utils import run_sync
 
 
-def ensure_async(func: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+def loop_safe(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    标记同步函数 `func` 不会阻塞，可以直接在 event loop 中运行，用作装饰器，例如：
+
+    ```py
+    @bot.on_message
+    @loop_safe
+    def handler(event):
+        print(event.user_id)
+    ```
+    """
+    func.__aiocqhttp_loop_safe__ = True
+    return func
+
+
+def ensure_async(func: Callable[..., Any],
+                 *,
+                 inline: bool = False,
+                 executor: Optional[Executor] = None
+                 ) -> Callable[..., Awaitable[Any]]:
     """
     确保可调用对象 `func` 为异步函数，如果不是，则使用 `run_sync`
     包裹，使其在 asyncio 的默认 executor 中运行。
+
+    若 `inline` 为 `True` 或 `func` 经过 `loop_safe` 标记，则直接在 event loop
+    中运行；若传入 `executor`，则在该 executor 而非默认 executor 中运行。
     """
     if asyncio.iscoroutinefunction(func):
         return func
-    else:
+
+    if inline or getattr(func, '__aiocqhttp_loop_safe__', False):
+
+        @functools.wraps(func)
+        async def inline_wrapper(*args, **kwargs) -> Any:
+            return func(*args, **kwargs)
+
+        return inline_wrapper
+
+    if executor is None:
         return run_sync(func)
 
+    @functools.wraps(func)
+    async def executor_wrapper(*args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, contextvars.copy_context().run,
+            functools.partial(func, *args, **kwargs))
+
+    return executor_wrapper
+
+
+def freeze_params(params: Dict[str, Any]) -> Optional[Hashable]:
+    """
+    将 API 参数字典转换为可哈希的键，参数值不可哈希时返回 `None`。
+    """
+    try:
+        key = tuple(sorted(params.items()))
+        hash(key)
+        return key
+    except TypeError:
+        return None
+
 
 def sync_wait(coro: Awaitable[Any], loop: asyncio.AbstractEventLoop) -> Any:
     """
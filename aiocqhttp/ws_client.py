@@ -0,0 +1,267 @@
+"""
+此模块提供了正向 WebSocket 客户端相关类，用于主动连接 OneBot 的正向 WebSocket 服务。
+"""
+
+import asyncio
+import contextvars
+import logging
+import random
+import ssl
+from typing import (Any, Awaitable, Callable, Dict, Iterable, List, Optional,
+                    Tuple, Union)
+from urllib.parse import urlsplit
+
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import (AcceptConnection, BytesMessage, CloseConnection,
+                            Ping, RejectConnection, Request, TextMessage)
+
+from .exceptions import NetworkError
+
+__all__ = [
+    'WebSocketConnection',
+    'WebSocketForwardClient',
+    'current_client',
+]
+
+current_client = contextvars.ContextVar('current_client', default=None)
+"""收到当前事件的 `WebSocketForwardClient`，不是从正向 WebSocket 收到的事件时为 `None`。"""
+
+_READ_SIZE = 65536
+
+
+class WebSocketConnection:
+    """
+    基于 ``wsproto`` 和 asyncio 流的 WebSocket 客户端连接。
+
+    `send` 可以同时在多个协程中调用，`receive` 同一时间只能在一个协程中调用。
+    """
+
+    def __init__(self, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter, ws: WSConnection):
+        self._reader = reader
+        self._writer = writer
+        self._ws = ws
+        self._drain_lock = asyncio.Lock()
+        self._pending_events = ws.events()
+        self._closed = False
+
+    @classmethod
+    async def connect(cls,
+                      url: str,
+                      headers: Iterable[Tuple[str, str]] = (),
+                      timeout_sec: Optional[float] = None
+                      ) -> 'WebSocketConnection':
+        """
+        连接 ``ws://`` 或 ``wss://`` URL 并完成握手，``headers`` 参数为额外的请求头。
+
+        连接失败或被拒绝时，抛出 `exceptions.NetworkError`。
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ('ws', 'wss') or not parts.hostname:
+            raise NetworkError(f'invalid WebSocket url "{url}"')
+        secure = parts.scheme == 'wss'
+        port = parts.port or (443 if secure else 80)
+        host = parts.hostname if parts.port is None \
+            else f'{parts.hostname}:{parts.port}'
+        target = (parts.path or '/') + \
+            (f'?{parts.query}' if parts.query else '')
+
+        try:
+            return await asyncio.wait_for(
+                cls._handshake(parts.hostname, port, host, target,
+                               ssl.create_default_context() if secure else
+                               None, headers), timeout_sec)
+        except asyncio.TimeoutError:
+            raise NetworkError('WebSocket handshake timeout')
+        except NetworkError:
+            raise  # a subclass of OSError, already descriptive
+        except OSError as e:
+            raise NetworkError(f'failed to connect: {e}')
+
+    @classmethod
+    async def _handshake(cls, hostname: str, port: int, host: str,
+                         target: str, ssl_context: Optional[ssl.SSLContext],
+                         headers: Iterable[Tuple[str, str]]
+                         ) -> 'WebSocketConnection':
+        reader, writer = await asyncio.open_connection(hostname,
+                                                       port,
+                                                       ssl=ssl_context)
+        ws = WSConnection(ConnectionType.CLIENT)
+        try:
+            writer.write(
+                ws.send(
+                    Request(host=host,
+                            target=target,
+                            extra_headers=[(k.encode(), v.encode())
+                                           for k, v in headers])))
+            await writer.drain()
+            while True:
+                data = await reader.read(_READ_SIZE)
+                ws.receive_data(data or None)
+                for event in ws.events():
+                    if isinstance(event, AcceptConnection):
+                        return cls(reader, writer, ws)
+                    if isinstance(event, RejectConnection):
+                        raise NetworkError(
+                            f'WebSocket handshake rejected with status '
+                            f'{event.status_code}')
+                if not data:
+                    raise NetworkError('connection closed during handshake')
+        except BaseException:
+            writer.close()
+            raise
+
+    @property
+    def closed(self) -> bool:
+        """连接是否已关闭。"""
+        return self._closed
+
+    async def send(self, text: str) -> None:
+        """发送文本消息，连接已关闭时抛出 `exceptions.NetworkError`。"""
+        if self._closed:
+            raise NetworkError('WebSocket connection closed')
+        self._writer.write(self._ws.send(TextMessage(data=text)))
+        try:
+            # concurrent drain() is not allowed before Python 3.10
+            async with self._drain_lock:
+                await self._writer.drain()
+        except OSError:
+            self._abort()
+            raise NetworkError('WebSocket connection closed')
+
+    async def receive(self) -> Union[str, bytes]:
+        """接收一条完整的消息，连接关闭时抛出 `exceptions.NetworkError`。"""
+        chunks: List[Union[str, bytes]] = []
+        while True:
+            for event in self._pending_events:
+                if isinstance(event, (TextMessage, BytesMessage)):
+                    chunks.append(event.data)
+                    if event.message_finished:
+                        return chunks[0][:0].join(chunks)
+                elif isinstance(event, Ping):
+                    self._writer.write(self._ws.send(event.response()))
+                elif isinstance(event, CloseConnection):
+                    try:
+                        self._writer.write(self._ws.send(event.response()))
+                    except Exception:
+                        pass
+                    self._abort()
+                    raise NetworkError('WebSocket connection closed')
+
+            if self._closed:
+                raise NetworkError('WebSocket connection closed')
+            try:
+                data = await self._reader.read(_READ_SIZE)
+            except OSError:
+                data = b''
+            if not data:
+                self._abort()
+                raise NetworkError('WebSocket connection closed')
+            self._ws.receive_data(data)
+            self._pending_events = self._ws.events()
+
+    async def close(self, code: int = 1000) -> None:
+        """关闭连接。"""
+        if self._closed:
+            return
+        try:
+            self._writer.write(self._ws.send(CloseConnection(code=code)))
+            await self._writer.drain()
+        except Exception:
+            pass
+        self._abort()
+
+    def _abort(self) -> None:
+        self._closed = True
+        self._writer.close()
+
+
+class WebSocketForwardClient:
+    """
+    连接单个 OneBot 正向 WebSocket 服务（Universal 端点）的客户端，断开后以指数退避的间隔自动重连。
+
+    收到的每条消息（事件或 API 调用结果）都以解码前的形式传给 ``on_message`` 协程函数；连接断开时调用
+    ``on_disconnect`` 函数。
+    """
+
+    def __init__(self,
+                 url: str,
+                 *,
+                 on_message: Callable[['WebSocketForwardClient',
+                                       Union[str, bytes]], Awaitable[Any]],
+                 on_disconnect: Optional[Callable[['WebSocketForwardClient'],
+                                                  Any]] = None,
+                 headers: Optional[Dict[str, str]] = None,
+                 connect_timeout_sec: float = 10,
+                 min_backoff_sec: float = 1,
+                 max_backoff_sec: float = 60,
+                 logger: Optional[logging.Logger] = None):
+        self.url = url
+        """OneBot 正向 WebSocket 服务的 URL。"""
+        self.self_id: Optional[str] = None
+        """连接的机器人账号，收到第一个事件后才能确定。"""
+        self._on_message = on_message
+        self._on_disconnect = on_disconnect
+        self._headers = headers or {}
+        self._connect_timeout = connect_timeout_sec
+        self._min_backoff = min_backoff_sec
+        self._max_backoff = max_backoff_sec
+        self._logger = logger or logging.getLogger(__name__)
+        self._conn: Optional[WebSocketConnection] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def connected(self) -> bool:
+        """当前是否已连接。"""
+        return self._conn is not None and not self._conn.closed
+
+    def start(self) -> None:
+        """在后台开始连接，重复调用不会重复连接。"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def close(self) -> None:
+        """断开连接并停止重连。"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            await conn.close()
+
+    async def send(self, text: str) -> None:
+        """发送文本消息，未连接时抛出 `exceptions.NetworkError`。"""
+        if self._conn is None:
+            raise NetworkError('WebSocket not connected')
+        await self._conn.send(text)
+
+    async def _run(self) -> None:
+        backoff = self._min_backoff
+        while True:
+            try:
+                self._conn = await WebSocketConnection.connect(
+                    self.url, self._headers.items(), self._connect_timeout)
+            except NetworkError as e:
+                self._logger.warning(f'failed to connect to {self.url}: {e}')
+            else:
+                self._logger.info(f'connected to {self.url}')
+                backoff = self._min_backoff
+                try:
+                    while True:
+                        await self._on_message(self, await self._conn.receive())
+                except NetworkError:
+                    self._logger.warning(f'disconnected from {self.url}')
+                finally:
+                    conn, self._conn = self._conn, None
+                    if conn is not None:
+                        await conn.close()
+                    if self._on_disconnect is not None:
+                        self._on_disconnect(self)
+
+            # jitter keeps reconnecting clients from moving in lockstep
+            delay = backoff * random.uniform(0.5, 1)
+            self._logger.info(f'reconnecting to {self.url} '
+                              f'in {delay:.1f} seconds')
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2, self._max_backoff)
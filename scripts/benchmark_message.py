@@ -0,0 +1,243 @@
+"""
+Benchmark of CQ code parsing and serialization, and of building and
+simplifying long messages.
+
+Compares the current implementation in aiocqhttp.message with the previous
+one (kept below for reference), after checking that both produce identical
+results on a set of fixed and random inputs.
+
+Usage: python scripts/benchmark_message.py [--fuzz N] [--segments N]
+"""
+
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiocqhttp.message import (Message, MessageSegment,  # noqa: E402
+                               MessageBuilder)
+
+
+def legacy_escape(s, *, escape_comma=True):
+    s = s.replace('&', '&amp;') \
+        .replace('[', '&#91;') \
+        .replace(']', '&#93;')
+    if escape_comma:
+        s = s.replace(',', '&#44;')
+    return s
+
+
+def legacy_unescape(s):
+    return s.replace('&#44;', ',') \
+        .replace('&#91;', '[') \
+        .replace('&#93;', ']') \
+        .replace('&amp;', '&')
+
+
+def legacy_split_iter(msg_str):
+
+    def iter_function_name_and_extra():
+        text_begin = 0
+        for cqcode in re.finditer(
+                r'\[CQ:(?P<type>[a-zA-Z0-9-_.]+)'
+                r'(?P<params>'
+                r'(?:,[a-zA-Z0-9-_.]+=[^,\]]*)*'
+                r'),?\]',
+                msg_str,
+        ):
+            yield 'text', msg_str[text_begin:cqcode.pos + cqcode.start()]
+            text_begin = cqcode.pos + cqcode.end()
+            yield cqcode.group('type'), cqcode.group('params').lstrip(',')
+        yield 'text', msg_str[text_begin:]
+
+    for function_name, extra in iter_function_name_and_extra():
+        if function_name == 'text':
+            if extra:
+                yield MessageSegment(type_=function_name,
+                                     data={'text': legacy_unescape(extra)})
+        else:
+            data = {
+                k: legacy_unescape(v) for k, v in map(
+                    lambda x: x.split('=', maxsplit=1),
+                    filter(lambda x: x, (x.lstrip() for x in extra.split(','))),
+                )
+            }
+            yield MessageSegment(type_=function_name, data=data)
+
+
+def legacy_parse(msg_str):
+    msg = Message()
+    for seg in legacy_split_iter(msg_str):
+        msg.append(seg)
+    return msg
+
+
+def legacy_seg_str(seg):
+    if seg.type == 'text':
+        return legacy_escape(seg.data.get('text', ''), escape_comma=False)
+
+    params = ','.join(
+        ('{}={}'.format(k, legacy_escape(str(v))) for k, v in seg.data.items()))
+    if params:
+        params = ',' + params
+    return '[CQ:{type}{params}]'.format(type=seg.type, params=params)
+
+
+def legacy_str(msg):
+    return ''.join((legacy_seg_str(seg) for seg in msg))
+
+
+def legacy_add(msg, other):
+    result = Message()
+    result.extend(msg)  # re-appends every segment
+    result.__iadd__(other)
+    return result
+
+
+def legacy_reduce(msg):
+    idx = 0
+    while idx < len(msg):
+        if idx > 0 and \
+                msg[idx - 1].type == 'text' and msg[idx].type == 'text':
+            msg[idx - 1].data['text'] += msg[idx].data['text']
+            del msg[idx]
+        else:
+            idx += 1
+
+
+def legacy_extract_plain_text(msg):
+    result = ''
+    for seg in msg:
+        if seg.type == 'text':
+            result += ' ' + seg.data['text']
+    if result:
+        result = result[1:]
+    return result
+
+
+def unreduced_message(n):
+    # long runs of text segments, as left by list operations or slicing
+    msg = Message()
+    for i in range(n):
+        list.append(msg, MessageSegment.text(f'line {i}\n'))
+        if i % 100 == 0:
+            list.append(msg, MessageSegment.face(i % 200))
+    return msg
+
+
+def report_parts(n):
+    return [MessageSegment.at(i) if i % 2 else f' 第 {i} 名\n' for i in range(n)]
+
+
+def build_with_add(parts, add=Message.__add__):
+    msg = Message()
+    for part in parts:
+        msg = add(msg, part)
+    return msg
+
+
+def build_with_builder(parts):
+    builder = MessageBuilder()
+    for part in parts:
+        builder.append(part)
+    return builder.build()
+
+
+def random_message(rng, length):
+    alphabet = ['a', 'b', ' ', '你', ',', '[', ']', '&', ';', '=', '#', '9',
+                '1', '4', 'amp', '&#44;', '&#91;', '&#93;', '&amp;', '[CQ:',
+                '[CQ:face,id=1]', '[CQ:at,qq=all]', '[CQ:image,file=a.jpg,]',
+                '[CQ:share,url=a=b,title=&#44;]', 'CQ:', ':', '.', '-', '_']
+    return ''.join(rng.choice(alphabet) for _ in range(length))
+
+
+def check(samples):
+    for s in samples:
+        new, old = Message(s), legacy_parse(s)
+        assert new == old, (s, new, old)
+        assert str(new) == legacy_str(old), s
+        for seg in new:
+            for v in seg.data.values():
+                assert str(MessageSegment(type_='x', data={'v': v})) == \
+                    legacy_seg_str(MessageSegment(type_='x', data={'v': v}))
+
+
+def bench(name, stmt, number, setup='pass'):
+    best = min(timeit.repeat(stmt, setup, number=number, repeat=5))
+    print(f'  {name:<8} {best / number * 1e6:10.2f} us')
+    return best
+
+
+def main():
+    fuzz = int(sys.argv[sys.argv.index('--fuzz') + 1]) \
+        if '--fuzz' in sys.argv else 20000
+    segments = int(sys.argv[sys.argv.index('--segments') + 1]) \
+        if '--segments' in sys.argv else 10000
+    rng = random.Random(0)
+    cases = {
+        'plain': '你好，今天天气怎么样？' * 3,
+        'large': 'lorem ipsum dolor sit amet, ' * 2000,
+        'dense': ''.join(
+            f'[CQ:at,qq={i}] 第{i}条 [CQ:face,id={i % 200}]'
+            f'[CQ:image,file={i:032x}.image,url=https://x/?a=1&amp;b=2]'
+            for i in range(500)),
+        'escaped': '&#91;不是 CQ 码&#93; &amp; &#44; ' * 500,
+    }
+
+    check(list(cases.values()) +
+          [random_message(rng, rng.randint(0, 40)) for _ in range(fuzz)])
+    print(f'identical output on {len(cases) + fuzz} inputs')
+
+    for case, s in cases.items():
+        number = max(1, 200000 // len(s))
+        msg = Message(s)
+        print(f'{case} ({len(s)} chars, {len(msg)} segments):')
+        print(' parse')
+        old = bench('legacy', lambda: legacy_parse(s), number)
+        new = bench('current', lambda: Message(s), number)
+        print(f'  speedup  {old / new:10.2f}x')
+        print(' serialize')
+        old = bench('legacy', lambda: legacy_str(msg), number)
+        new = bench('current', lambda: str(msg), number)
+        print(f'  speedup  {old / new:10.2f}x')
+
+    for n in range(0, 50):
+        old, new = unreduced_message(n), unreduced_message(n)
+        legacy_reduce(old)
+        new.reduce()
+        assert old == new
+        assert legacy_extract_plain_text(old) == new.extract_plain_text()
+        parts = report_parts(n)
+        assert build_with_builder(parts) == build_with_add(parts)
+    print(f'{segments} segments:')
+    msg = unreduced_message(segments)
+    print(' reduce')
+    copies = []
+
+    def setup():
+        copies.append(unreduced_message(segments))
+
+    old = bench('legacy', lambda: legacy_reduce(copies.pop()), 1, setup)
+    new = bench('current', lambda: copies.pop().reduce(), 1, setup)
+    print(f'  speedup  {old / new:10.2f}x')
+    print(' extract_plain_text')
+    old = bench('legacy', lambda: legacy_extract_plain_text(msg), 10)
+    new = bench('current', lambda: msg.extract_plain_text(), 10)
+    print(f'  speedup  {old / new:10.2f}x')
+    print(' build')
+    # the legacy "+" is quadratic and too slow for the full size
+    small = report_parts(min(segments, 1000))
+    parts = report_parts(segments)
+    bench('legacy +', lambda: build_with_add(small, legacy_add), 1)
+    bench('current +', lambda: build_with_add(small), 1)
+    bench('builder', lambda: build_with_builder(small), 1)
+    print(f'  (above with {len(small)} parts, below with {len(parts)})')
+    bench('current +', lambda: build_with_add(parts), 1)
+    bench('builder', lambda: build_with_builder(parts), 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Check of the forward WebSocket transport against a local stand-in OneBot
+server, built on wsproto like the client itself.
+
+Covers the handshake (including a rejected access token), event delivery,
+pipelined API calls answered out of order, failing pending calls when the
+connection drops, and reconnecting afterwards.
+
+Usage: python scripts/check_ws_forward.py [--calls N]
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import (AcceptConnection, CloseConnection,
+                            RejectConnection, Request, TextMessage)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiocqhttp.api_impl import WebSocketForwardApi  # noqa: E402
+from aiocqhttp.exceptions import NetworkError  # noqa: E402
+from aiocqhttp.ws_client import (WebSocketConnection,  # noqa: E402
+                                 current_client)
+
+ACCESS_TOKEN = 'secret'
+SELF_ID = 10000
+
+
+class StandInServer:
+    """
+    A minimal OneBot forward WebSocket (Universal) server. On connect it
+    sends a lifecycle event and a message event, then answers "echo" calls
+    after a random delay and never answers "hang" calls.
+    """
+
+    def __init__(self):
+        self.connections = 0
+        self.writers = set()
+        self._server = None
+
+    @property
+    def url(self):
+        port = self._server.sockets[0].getsockname()[1]
+        return f'ws://127.0.0.1:{port}/'
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+
+    async def stop(self):
+        self.drop()
+        self._server.close()
+        await self._server.wait_closed()
+
+    def drop(self):
+        """Abort all connections without a closing handshake."""
+        for writer in list(self.writers):
+            writer.transport.abort()
+
+    async def _handle(self, reader, writer):
+        ws = WSConnection(ConnectionType.SERVER)
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    return
+                ws.receive_data(data)
+                request = next(
+                    (e for e in ws.events() if isinstance(e, Request)), None)
+                if request is not None:
+                    break
+            headers = dict(request.extra_headers)
+            if headers.get(b'authorization') != \
+                    f'Bearer {ACCESS_TOKEN}'.encode():
+                writer.write(ws.send(RejectConnection(status_code=403)))
+                await writer.drain()
+                return
+
+            writer.write(ws.send(AcceptConnection()))
+            self.connections += 1
+            self.writers.add(writer)
+            lock = asyncio.Lock()
+
+            async def send(obj):
+                async with lock:
+                    writer.write(ws.send(TextMessage(data=json.dumps(obj))))
+                    await writer.drain()
+
+            async def answer(call):
+                await asyncio.sleep(random.random() * 0.05)
+                await send({
+                    'status': 'ok',
+                    'retcode': 0,
+                    'data': {'n': call['params'].get('n')},
+                    'echo': call['echo'],
+                })
+
+            await send({
+                'post_type': 'meta_event',
+                'meta_event_type': 'lifecycle',
+                'sub_type': 'connect',
+                'self_id': SELF_ID,
+            })
+            await send({
+                'post_type': 'message',
+                'message_type': 'private',
+                'sub_type': 'friend',
+                'self_id': SELF_ID,
+                'user_id': 1,
+                'message': f'hello {self.connections}',
+            })
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    return
+                ws.receive_data(data)
+                for event in ws.events():
+                    if isinstance(event, CloseConnection):
+                        writer.write(ws.send(event.response()))
+                        return
+                    if isinstance(event, TextMessage):
+                        call = json.loads(event.data)
+                        if call['action'] == 'echo':
+                            asyncio.ensure_future(answer(call))
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+
+async def wait_for(predicate, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, 'timed out'
+        await asyncio.sleep(0.01)
+
+
+async def check(calls):
+    server = StandInServer()
+    await server.start()
+
+    try:
+        await WebSocketConnection.connect(server.url, [
+            ('Authorization', 'Bearer wrong')
+        ], 5)
+        raise AssertionError('handshake with a wrong token succeeded')
+    except NetworkError as e:
+        print(f'wrong token rejected: {e}')
+
+    events = []
+
+    async def on_event(payload):
+        assert current_client.get() is not None
+        events.append(payload)
+
+    api = WebSocketForwardApi([server.url], ACCESS_TOKEN, 10,
+                              on_event=on_event)
+    api.open()
+    try:
+        await wait_for(lambda: len(events) >= 2)
+        assert api.clients[0].self_id == str(SELF_ID)
+        print(f'handshake ok, events received: {len(events)}')
+
+        results = await asyncio.gather(
+            *(api.call_action('echo', n=i) for i in range(calls)))
+        assert [r['n'] for r in results] == list(range(calls))
+        print(f'{calls} pipelined calls matched out-of-order answers')
+
+        loop = asyncio.get_running_loop()
+        hang = asyncio.ensure_future(api.call_action('hang'))
+        await asyncio.sleep(0.1)
+        start = loop.time()
+        server.drop()
+        try:
+            await hang
+            raise AssertionError('pending call survived the drop')
+        except NetworkError as e:
+            print(f'pending call failed after '
+                  f'{loop.time() - start:.2f}s on drop: {e}')
+
+        await wait_for(lambda: server.connections >= 2 and
+                       api.clients[0].connected)
+        assert (await api.call_action('echo', n=42))['n'] == 42
+        print('reconnected, calls work again')
+    finally:
+        await api.close()
+        await server.stop()
+
+
+def main():
+    calls = int(sys.argv[sys.argv.index('--calls') + 1]) \
+        if '--calls' in sys.argv else 200
+    asyncio.run(check(calls))
+    print('all checks passed')
+
+
+if __name__ == '__main__':
+    main()
@@ -109,11 +109,26 @@ class Api:
                 f') -> {ret}: ...')
 
 
-def create_params(param_block: str):
+SEND_ACTIONS = ('send_msg', 'send_group_msg', 'send_private_msg')
+
+
+def create_common_params(action: str):
+    # parameters understood by aiocqhttp itself, not passed to OneBot
+    params = [
+        ApiParam('self_id', 'Optional[int]', 'None', '机器人 QQ 号'),
+        ApiParam('timeout', 'Optional[float]', 'None',
+                 '本次调用的超时时间（秒），不传入则使用默认的超时时间'),
+    ]
+    if action in SEND_ACTIONS:
+        params.append(ApiParam('bulk', 'bool', 'False',
+                               '是否为批量发送，启用发送限速时优先级低于普通发送'))
+    return params
+
+
+def create_params(action: str, param_block: str):
     params = []
     if param_block.strip() == '无':
-        params.append(ApiParam('self_id', 'Optional[int]', 'None', '机器人 QQ 号'))
-        return params
+        return create_common_params(action)
     if re.search(r'^\|\s*字段名\s*\|\s*数据类型\s*\|\s*默认值\s*\|\s*说明\s*\|',
                  param_block, re.MULTILINE):
         rows = re.findall(r'^\|([^|]+)\|([^|]+)\|([^|]+)\|([^|]+)\|',
@@ -142,8 +157,7 @@ def create_params(param_block: str):
             default = default.capitalize()
         pdesc = pdesc.replace('true', 'True').replace('false', 'False')
         params.append(ApiParam(name, type_, default, pdesc))
-    params.append(ApiParam('self_id', 'Optional[int]', 'None', '机器人 QQ 号'))
-    return params
+    return params + create_common_params(action)
 
 
 def create_ret(action: str, ret_block: str):
@@ -192,7 +206,7 @@ def create_apis(fn: str) -> List[Api]:
         flags=re.MULTILINE | re.DOTALL)
 
     for action, desc, param_block, ret_block in section_blocks:
-        params = create_params(param_block)
+        params = create_params(action, param_block)
         ret = create_ret(action, ret_block)
         apis.append(Api(action, desc, ret, params))
     return apis
@@ -18,9 +18,10 @@ setup(
     package_data={
         '': ['*.pyi'],
     },
-    install_requires=['Quart>=0.17,<1.0', 'httpx>=0.11,<1.0'],
+    install_requires=['Quart>=0.17,<1.0', 'httpx>=0.18,<1.0',
+                      'wsproto>=0.14,<2.0'],
     extras_require={
-        'all': ['ujson'],
+        'all': ['orjson', 'h2'],
     },
     python_requires='>=3.7',
     platforms='any',